@@ -0,0 +1,210 @@
+"""
+Memory-mapped reader for archive fragment files.
+
+Lines and fragments are returned as memoryview slices of the mapping, so
+reading a multi-GB archive never copies it into Python objects. Fragment
+tags ('[FRAGMENT 001] ...') are located once and stored in a sidecar
+offset index next to the archive; later lookups by number are O(1).
+"""
+
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+FRAGMENT_TAG = re.compile(rb"\[FRAGMENT (\d+)\]")
+# Tags after a newline; a leading literal keeps the scan on the fast
+# path, unlike a MULTILINE '^' anchor
+LINE_FRAGMENT_TAG = re.compile(rb"\n\[FRAGMENT (\d+)\]")
+
+# Sidecar layout: header (magic, archive size, mtime_ns, count), then
+# the int64 fragment numbers and the int64 tag offsets, in archive order
+INDEX_SUFFIX = ".fragidx"
+INDEX_HEADER = struct.Struct("<8sqqq")
+INDEX_MAGIC = b"FRAGIDX2"
+
+
+class ArchiveReader:
+    """Read-only, memory-mapped view of an archive file."""
+
+    def __init__(self, path: str, index_path: Optional[str] = None) -> None:
+        self.path = path
+        self.index_path = index_path or path + INDEX_SUFFIX
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if size
+            else None
+        )
+        self._view = memoryview(self._map) if self._map is not None else memoryview(b"")
+        self._numbers: Optional[array] = None
+        self._starts = array("q")
+        self._first_number = 0
+        self._dense = False
+        self._positions: Optional[Dict[int, int]] = None
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the archive. The file is always closed; if views from
+        iter_lines() or fragment() are still referenced, the mapping stays
+        valid for them and is unmapped when the last one is dropped.
+        """
+        self._view.release()
+        try:
+            if self._map is not None:
+                self._map.close()
+        except BufferError:
+            # Live exports: dropping our reference leaves the mapping to them
+            pass
+        finally:
+            self._map = None
+            self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        """True once close() has run, as for file objects."""
+        return self._file.closed
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def iter_lines(self) -> Iterator[memoryview]:
+        """Yield each line, without its newline, as a zero-copy view."""
+        mapped = self._map
+        if mapped is None:
+            return
+        view = self._view
+        size = len(view)
+        start = 0
+        while start < size:
+            end = mapped.find(b"\n", start)
+            if end < 0:
+                end = size
+            yield view[start:end]
+            start = end + 1
+
+    def build_index(self) -> int:
+        """Scan the archive for fragment tags and write the sidecar index."""
+        numbers = array("q")
+        starts = array("q")
+        mapped = self._map
+        if mapped is not None:
+            first = FRAGMENT_TAG.match(mapped)
+            if first:
+                numbers.append(int(first.group(1)))
+                starts.append(0)
+            numbers.extend(map(int, LINE_FRAGMENT_TAG.findall(mapped)))
+            # Offsets of the preceding newlines, shifted onto the tags
+            newlines = map(re.Match.start, LINE_FRAGMENT_TAG.finditer(mapped))
+            starts.extend(map((1).__add__, newlines))
+
+        stat = os.fstat(self._file.fileno())
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as index:
+            index.write(
+                INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(numbers))
+            )
+            numbers.tofile(index)
+            starts.tofile(index)
+        os.replace(temp_path, self.index_path)
+        self._set_index(numbers, starts)
+        return len(numbers)
+
+    def load_index(self) -> int:
+        """Load the sidecar index, rebuilding it if missing or stale."""
+        stat = os.fstat(self._file.fileno())
+        try:
+            with open(self.index_path, "rb") as index:
+                magic, size, mtime_ns, count = INDEX_HEADER.unpack(
+                    index.read(INDEX_HEADER.size)
+                )
+                if (magic, size, mtime_ns) != (INDEX_MAGIC, stat.st_size, stat.st_mtime_ns):
+                    return self.build_index()
+                numbers = array("q")
+                starts = array("q")
+                numbers.fromfile(index, count)
+                starts.fromfile(index, count)
+        except (FileNotFoundError, EOFError, struct.error):
+            return self.build_index()
+        self._set_index(numbers, starts)
+        return count
+
+    def _set_index(self, numbers: array, starts: array) -> None:
+        self._numbers = numbers
+        self._starts = starts
+        self._positions = None
+        # Fragments numbered first, first + 1, ... are found by arithmetic
+        self._first_number = numbers[0] if numbers else 0
+        self._dense = numbers == array(
+            "q", range(self._first_number, self._first_number + len(numbers))
+        )
+
+    def fragment_numbers(self) -> Iterator[int]:
+        """Fragment numbers in archive order."""
+        if self._numbers is None:
+            self.load_index()
+        return iter(self._numbers)
+
+    def fragment(self, number: int) -> memoryview:
+        """Return fragment number as a zero-copy view (KeyError if absent)."""
+        start, end = self._locate(number)
+        return self._view[start:end]
+
+    def _locate(self, number: int) -> Tuple[int, int]:
+        if self._numbers is None:
+            self.load_index()
+        if self._dense:
+            slot = number - self._first_number
+            if not 0 <= slot < len(self._numbers):
+                raise KeyError(number)
+        else:
+            if self._positions is None:
+                # Sparse or repeated numbers: the first occurrence wins
+                self._positions = {}
+                for slot in range(len(self._numbers) - 1, -1, -1):
+                    self._positions[self._numbers[slot]] = slot
+            slot = self._positions[number]
+        starts = self._starts
+        start = starts[slot]
+        if slot + 1 < len(starts):
+            # Tags start lines, so the next one follows a newline
+            end = starts[slot + 1] - 1
+        else:
+            end = len(self._view)
+            if end > start and self._view[end - 1] == ord("\n"):
+                end -= 1
+        return start, end
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage: archive_reader.py <archive> [fragment number ...]")
+        sys.exit(1)
+
+    print("=== CYBER ARCHIVES - MAPPED RECOVERY SYSTEM ===")
+    with ArchiveReader(sys.argv[1]) as reader:
+        count = reader.load_index()
+        print(f"Storage vault mapped: {len(reader)} bytes, {count} fragments")
+        for number in sys.argv[2:]:
+            try:
+                fragment = reader.fragment(int(number))
+            except (KeyError, ValueError):
+                print(f"ERROR: Fragment {number} not found")
+                continue
+            print(str(fragment, "utf-8", "replace"))
+            fragment.release()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from archive_reader import ArchiveReader
+
+ARCHIVE = (
+    b"[FRAGMENT 001] Digital preservation protocols established\n"
+    b"[FRAGMENT 002] Knowledge must survive the entropy wars\n"
+    b"[FRAGMENT 003] Every byte saved is a victory against oblivion\n"
+)
+
+
+class ArchiveReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, "wb") as archive:
+            archive.write(ARCHIVE)
+
+    def tearDown(self):
+        for path in (self.path, self.path + ".fragidx"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_with_and_for_over_lines(self):
+        lines = []
+        with ArchiveReader(self.path) as reader:
+            self.assertFalse(reader.closed)
+            # The loop variable still holds the last view when the block exits
+            for line in reader.iter_lines():
+                lines.append(bytes(line))
+        self.assertEqual(lines, ARCHIVE.splitlines())
+        self.assertTrue(reader.closed)
+
+    def test_close_with_live_fragment_view(self):
+        with ArchiveReader(self.path) as reader:
+            fragment = reader.fragment(2)
+        self.assertTrue(reader.closed)
+        # The view stays usable until it is dropped
+        self.assertEqual(
+            bytes(fragment), b"[FRAGMENT 002] Knowledge must survive the entropy wars"
+        )
+
+    def test_close_is_idempotent(self):
+        reader = ArchiveReader(self.path)
+        self.assertEqual(len(list(reader.iter_lines())), 3)
+        reader.close()
+        reader.close()
+        self.assertTrue(reader.closed)
+
+    def test_empty_archive(self):
+        with open(self.path, "wb"):
+            pass
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(list(reader.iter_lines()), [])
+            self.assertEqual(reader.load_index(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import time
+
+from archive_writer import FSYNC_POLICIES, ArchiveWriter
+
+
+def report(label: str, count: int, elapsed: float) -> None:
+    print(f"{label:<28} {count:>10,} entries  {elapsed:8.3f}s  {count / elapsed:>12,.0f} entries/s")
+
+
+def records(count: int):
+    return (f"Archived record {number}" for number in range(1, count + 1))
+
+
+def per_entry(path: str, count: int, console=None) -> None:
+    """Previous approach, for reference: one write (and print) per entry."""
+    with open(path, "w") as archive:
+        for number, text in enumerate(records(count), 1):
+            entry = f"[ENTRY {number:03d}] {text}\n"
+            archive.write(entry)
+            if console is not None:
+                print(entry.strip(), file=console)
+
+
+def batched(path: str, count: int, fsync: str, batch_size: int, console=None) -> None:
+    with ArchiveWriter(
+        path, batch_size=batch_size, fsync=fsync, echo=console is not None, console=console
+    ) as archive:
+        archive.write_many(records(count))
+
+
+def best_of(repeats: int, run, *args) -> float:
+    """Fastest of several runs; single runs are dominated by noise."""
+    elapsed = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run(*args)
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    print("=== CYBER ARCHIVES - WRITER BENCHMARK ===")
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as console:
+        path = os.path.join(directory, "archive.txt")
+
+        elapsed = best_of(repeats, per_entry, path, count)
+        report("write per entry", count, elapsed)
+        reference = os.path.getsize(path)
+
+        elapsed = best_of(repeats, per_entry, path, count, console)
+        report("write + print per entry", count, elapsed)
+
+        # Without echo, expect batched writes near the per-entry rate (see
+        # archive_writer); fsync=batch and fsync=close also pay for syncs
+        for fsync in FSYNC_POLICIES:
+            elapsed = best_of(repeats, batched, path, count, fsync, batch_size)
+            report(f"fsync={fsync} (x{batch_size})", count, elapsed)
+            if os.path.getsize(path) != reference:
+                print("    WARNING: output differs from the per-entry archive")
+
+        elapsed = best_of(repeats, batched, path, count, "close", batch_size, console)
+        report(f"fsync=close + echo (x{batch_size})", count, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+from archive_writer import ArchiveWriter
+
+
 def create_archive():
     print("=== CYBER ARCHIVES - PRESERVATION SYSTEM ===")
 
@@ -6,19 +9,14 @@ def create_archive():
     print("Storage unit created successfully...")
     print("Inscribing preservation data...")
 
-    file = open(filename, "w")
-
     entries = [
-        "[ENTRY 001] New quantum algorithm discovered\n",
-        "[ENTRY 002] Efficiency increased by 347%\n",
-        "[ENTRY 003] Archived by Data Archivist trainee\n",
+        "New quantum algorithm discovered",
+        "Efficiency increased by 347%",
+        "Archived by Data Archivist trainee",
     ]
 
-    for entry in entries:
-        file.write(entry)
-        print(entry.strip())
-
-    file.close()
+    with ArchiveWriter(filename, echo=True) as archive:
+        archive.write_many(entries)
 
     print("\nData inscription complete. Storage unit sealed.")
     print(f"Archive '{filename}' ready for long-term preservation.")
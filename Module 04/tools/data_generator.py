@@ -6,12 +6,41 @@ Generates structured test data for file operation exercises with comprehensive
 error handling, type safety, and extensible architecture.
 """
 
+import argparse
+import hashlib
 import json
+import math
+import os
+import random
+import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import wraps
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Callable, Any
-from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from datetime import datetime, timezone
+
+
+# Bump when generation logic changes so every manifest entry goes stale
+GENERATOR_VERSION = "3"
+MANIFEST_NAME = "manifest.json"
+
+
+# Manifest layout: files are grouped by (template, template version,
+# params) and each file maps to [size, mtime_ns, blake2b]
+ManifestKey = Tuple[str, str, str]
+ManifestFiles = Dict[str, List[Any]]
 
 
 def handle_file_errors(func: Callable) -> Callable:
@@ -41,16 +70,154 @@ def validate_output(func: Callable) -> Callable:
     """Decorator to validate generated content before writing."""
 
     @wraps(func)
-    def wrapper(self, filename: str, content: str, *args, **kwargs):
-        if not content or not content.strip():
-            raise ValueError(f"Empty content for {filename}")
-        if len(content) > 10000:  # Reasonable size limit
-            raise ValueError(f"Content too large for {filename}")
+    def wrapper(
+        self, filename: str, content: Union[str, Iterable[str]], *args, **kwargs
+    ):
+        if isinstance(content, str):
+            if not content or not content.strip():
+                raise ValueError(f"Empty content for {filename}")
+            self.size_policy.check(filename, len(content))
+        else:
+            # Chunk iterators are checked as they are written
+            content = _checked_chunks(self.size_policy, filename, content)
         return func(self, filename, content, *args, **kwargs)
 
     return wrapper
 
 
+def _checked_chunks(
+    policy: "SizePolicy", filename: str, chunks: Iterable[str]
+) -> Iterator[str]:
+    """Pass chunks through, enforcing the size policy and non-empty content."""
+    size = 0
+    blank = True
+    for chunk in chunks:
+        size += len(chunk)
+        policy.check(filename, size)
+        if blank and chunk.strip():
+            blank = False
+        yield chunk
+    if blank:
+        raise ValueError(f"Empty content for {filename}")
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as '512', '64KB', '10MB' or '2GB' into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", text.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    number, unit = match.groups()
+    return int(float(number) * {"": 1, "K": 2**10, "M": 2**20, "G": 2**30}[unit])
+
+
+class SizePolicy:
+    """Upper bound on generated content size (None disables the check)."""
+
+    def __init__(self, max_chars: Optional[int] = 10000) -> None:
+        self.max_chars = max_chars
+
+    def check(self, filename: str, size: int) -> None:
+        """Raise ValueError if size exceeds the policy limit."""
+        if self.max_chars is not None and size > self.max_chars:
+            raise ValueError(
+                f"Content too large for {filename} "
+                f"({size} > {self.max_chars} characters)"
+            )
+
+
+class SizeDistribution:
+    """
+    Target file sizes for bulk generation.
+
+    Kinds: 'fixed' (size), 'uniform' (low, high) and 'lognormal'
+    (median, sigma), always clamped to [1, cap] bytes.
+    """
+
+    KINDS = ("fixed", "uniform", "lognormal")
+
+    def __init__(
+        self,
+        kind: str = "fixed",
+        size: int = 4096,
+        low: int = 1024,
+        high: int = 65536,
+        sigma: float = 1.0,
+        cap: Optional[int] = None,
+    ) -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown size distribution: {kind}")
+        self.kind = kind
+        self.size = size
+        self.low = low
+        self.high = high
+        self.sigma = sigma
+        self.cap = cap
+
+    @classmethod
+    def parse(cls, spec: str) -> "SizeDistribution":
+        """Build from 'fixed:1MB', 'uniform:1KB-10MB' or 'lognormal:1MB,1.5'."""
+        kind, _, args = spec.partition(":")
+        if kind == "fixed":
+            return cls("fixed", size=parse_size(args))
+        if kind == "uniform":
+            low, _, high = args.partition("-")
+            return cls("uniform", low=parse_size(low), high=parse_size(high))
+        if kind == "lognormal":
+            median, _, sigma = args.partition(",")
+            return cls("lognormal", size=parse_size(median), sigma=float(sigma or 1.0))
+        raise ValueError(f"Unknown size distribution: {spec!r}")
+
+    def sample(self, rng: random.Random) -> int:
+        """Draw one target size in bytes."""
+        if self.kind == "fixed":
+            size = self.size
+        elif self.kind == "uniform":
+            size = rng.randint(self.low, self.high)
+        else:
+            size = int(rng.lognormvariate(math.log(self.size), self.sigma))
+        if self.cap is not None:
+            size = min(size, self.cap)
+        return max(size, 1)
+
+    def __repr__(self) -> str:
+        if self.kind == "fixed":
+            return f"fixed:{self.size}"
+        if self.kind == "uniform":
+            return f"uniform:{self.low}-{self.high}"
+        return f"lognormal:{self.size},{self.sigma}"
+
+
+def _generate_bulk_file(
+    task: Tuple[str, str, Dict[str, Any], SizeDistribution, Optional[int], int]
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """Process pool worker: stream one bulk file to disk."""
+    base_path, filename, entry, sizes, max_chars, buffer_size = task
+    generator = ArchiveDataGenerator(
+        base_path, SizePolicy(max_chars), verbose=False, buffer_size=buffer_size
+    )
+    template_name = entry["template"]
+    # One seeded stream per file: identical output for any worker count
+    rng = random.Random(f"{entry['seed']}:{template_name}:{entry['index']}")
+    size = sizes.sample(rng)
+    try:
+        generator.size_policy.check(filename, size)
+    except ValueError as e:
+        return filename, None, str(e)
+    chunks = generator._iter_bulk_content(template_name, size, rng)
+    if not generator._write_file(filename, chunks, manifest_entry=entry):
+        return filename, None, "write failed"
+    return filename, entry, None
+
+
+def _hash_file(path: str, buffer_size: int = 1 << 20) -> str:
+    """BLAKE2b digest of a file, read in buffer_size blocks."""
+    hasher = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(buffer_size), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
 class DataTemplates:
     """Centralized template definitions with metadata."""
 
@@ -96,11 +263,31 @@ class DataTemplates:
 class ArchiveDataGenerator:
     """Main data generation class with comprehensive file operations."""
 
-    def __init__(self, base_path: Optional[str] = None) -> None:
-        """Initialize generator with optional base path."""
+    # Numbered tags such as '[FRAGMENT 001]' are renumbered in bulk files
+    NUMBERED_TAG = re.compile(r"^\[([A-Z]+) \d+\]")
+
+    # Bulk content is yielded in chunks of this many lines
+    CHUNK_LINES = 1024
+
+    def __init__(
+        self,
+        base_path: Optional[str] = None,
+        size_policy: Optional[SizePolicy] = None,
+        verbose: bool = True,
+        buffer_size: int = 1 << 20,
+        incremental: bool = True,
+    ) -> None:
+        """Initialize generator with optional base path and size policy."""
         self.base_path = Path(base_path) if base_path else Path(".")
         self.templates = DataTemplates.get_templates()
         self.generated_files: List[str] = []
+        self.size_policy = size_policy or SizePolicy()
+        self.verbose = verbose
+        self.buffer_size = buffer_size
+        # Skip files whose manifest entry is still current
+        self.incremental = incremental
+        self._base_dir = str(self.base_path) + os.sep
+        self.manifest: Optional[Dict[ManifestKey, ManifestFiles]] = None
 
         # Ensure base directory exists
         try:
@@ -110,62 +297,362 @@ class ArchiveDataGenerator:
 
     @validate_output
     @handle_file_errors
-    def _write_file(self, filename: str, content: str) -> bool:
-        """Write content to file with comprehensive error handling."""
+    def _write_file(
+        self,
+        filename: str,
+        content: Union[str, Iterable[str]],
+        manifest_entry: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Write a string or an iterator of chunks through a buffer of
+        buffer_size bytes. Output goes to a temporary file that is renamed
+        into place, so readers never see a partial file. The BLAKE2b hash
+        is computed while writing and stored in manifest_entry, if given.
+        """
         file_path = self.base_path / filename
+        temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+        hasher = hashlib.blake2b(digest_size=32)
 
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(content)
+        try:
+            with open(temp_path, "wb", buffering=self.buffer_size) as file:
+                for chunk in [content] if isinstance(content, str) else content:
+                    data = chunk.encode("utf-8")
+                    hasher.update(data)
+                    file.write(data)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        if manifest_entry is not None:
+            stat = file_path.stat()
+            manifest_entry.update(
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                blake2b=hasher.hexdigest(),
+            )
 
         self.generated_files.append(filename)
-        print(f"Generated: {filename}")
+        if self.verbose:
+            print(f"Generated: {filename}")
         return True
 
-    def _format_content(self, template_data: Dict[str, Any]) -> str:
-        """Format template content into string representation."""
+    def template_version(self, template_name: str) -> str:
+        """Short hash of a template definition and the generator version."""
+        definition = json.dumps(
+            [GENERATOR_VERSION, self.templates[template_name]], sort_keys=True
+        )
+        return hashlib.blake2b(definition.encode(), digest_size=8).hexdigest()
+
+    def load_manifest(self) -> Dict[ManifestKey, ManifestFiles]:
+        """Load (once) the manifest groups of base_path."""
+        if self.manifest is None:
+            try:
+                data = json.loads((self.base_path / MANIFEST_NAME).read_text())
+            except FileNotFoundError:
+                data = {}
+            except ValueError as e:
+                print(f"Warning: Ignoring unreadable manifest: {e}")
+                data = {}
+            self.manifest = {}
+            if data.get("generator_version") == GENERATOR_VERSION:
+                for group in data.get("groups", []):
+                    key = (group["template"], group["template_version"], group["params"])
+                    self.manifest[key] = group["files"]
+        return self.manifest
+
+    def save_manifest(self) -> None:
+        """Atomically write the manifest next to the generated files."""
+        manifest_path = self.base_path / MANIFEST_NAME
+        temp_path = manifest_path.with_name(f".{MANIFEST_NAME}.{os.getpid()}.tmp")
+        groups = [
+            {
+                "template": template,
+                "template_version": version,
+                "params": params,
+                "files": files,
+            }
+            for (template, version, params), files in self.load_manifest().items()
+            if files
+        ]
+        data = {"generator_version": GENERATOR_VERSION, "groups": groups}
+        temp_path.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(temp_path, manifest_path)
+
+    def _is_current(self, filename: str, key: ManifestKey) -> bool:
+        """True if filename matches its manifest entry; checked by stat only."""
+        files = self.load_manifest().get(key)
+        fields = files.get(filename) if files else None
+        if fields is None:
+            return False
+        try:
+            # Plain string paths: pathlib dominates the cost of a no-op run
+            stat = os.stat(self._base_dir + filename)
+        except OSError:
+            return False
+        return stat.st_size == fields[0] and stat.st_mtime_ns == fields[1]
+
+    def _record(self, filename: str, entry: Dict[str, Any]) -> None:
+        manifest = self.load_manifest()
+        # A regenerated file leaves any group it belonged to before
+        for files in manifest.values():
+            files.pop(filename, None)
+        key = (entry["template"], entry["template_version"], entry["params"])
+        manifest.setdefault(key, {})[filename] = [
+            entry["size"],
+            entry["mtime_ns"],
+            entry["blake2b"],
+        ]
+
+    def _generate_fixture(
+        self,
+        filename: str,
+        template_name: str,
+        content: Callable[[], Iterable[str]],
+        version: Optional[str] = None,
+    ) -> Optional[bool]:
+        """
+        Write one fixture unless its manifest entry is still current.
+        content returns the chunks lazily; it is only called when the
+        file is actually written.
+        """
+        version = version or self.template_version(template_name)
+        if self.incremental and self._is_current(filename, (template_name, version, "")):
+            self.generated_files.append(filename)
+            if self.verbose:
+                print(f"Up to date: {filename}")
+            return True
+        entry = {"template": template_name, "template_version": version, "params": ""}
+        result = self._write_file(filename, content(), manifest_entry=entry)
+        if result:
+            self._record(filename, entry)
+        return result
+
+    def verify(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Check every manifest entry against the file on disk, hashing files
+        from a thread pool (hashlib releases the GIL on large blocks).
+
+        Returns a report with the number of files checked and the failures.
+        """
+        entries = [
+            (filename, fields)
+            for files in self.load_manifest().values()
+            for filename, fields in files.items()
+        ]
+
+        def check(item: Tuple[str, List[Any]]) -> Optional[Tuple[str, str]]:
+            filename, (size, _, digest) = item
+            path = self._base_dir + filename
+            try:
+                if os.stat(path).st_size != size:
+                    return filename, "size mismatch"
+                if _hash_file(path, self.buffer_size) != digest:
+                    return filename, "hash mismatch"
+            except FileNotFoundError:
+                return filename, "missing"
+            except OSError as e:
+                return filename, f"unreadable: {e}"
+            return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            failures = [
+                failure
+                for failure in executor.map(check, entries)
+                if failure is not None
+            ]
+        if self.verbose:
+            for filename, problem in failures:
+                print(f"Verify failed: {filename} ({problem})")
+            print(f"Verified {len(entries) - len(failures)}/{len(entries)} files")
+        return {"checked": len(entries), "failed": failures}
+
+    def _iter_content(self, template_data: Dict[str, Any]) -> Iterator[str]:
+        """Yield template content line by line, newline-separated."""
         content = template_data.get("content", "")
 
         if isinstance(content, list):
-            return "\n".join(content)
+            for index, line in enumerate(content):
+                yield line if index == 0 else "\n" + line
         elif isinstance(content, str):
-            return content
+            yield content
         else:
-            return str(content)
+            yield str(content)
+
+    def _format_content(self, template_data: Dict[str, Any]) -> str:
+        """Format template content into string representation."""
+        return "".join(self._iter_content(template_data))
+
+    def _iter_bulk_content(
+        self, template_name: str, size: int, rng: random.Random
+    ) -> Iterator[str]:
+        """
+        Lazily yield exactly size characters of newline-separated lines
+        drawn from a template, CHUNK_LINES lines per chunk. The last line
+        is cut short so the output never exceeds the sampled size.
+        """
+        content = self.templates[template_name].get("content", "")
+        lines = content if isinstance(content, list) else [str(content)]
+        parts: List[str] = []
+        # Characters produced so far; the first line has no separator
+        total = -1
+        number = 0
+        separator = ""
+        while total + 1 < size:
+            line = rng.choice(lines)
+            tag = self.NUMBERED_TAG.match(line)
+            if tag:
+                number += 1
+                line = f"[{tag.group(1)} {number:03d}]{line[tag.end():]}"
+            line = line[: size - total - 1]
+            parts.append(line)
+            total += len(line) + 1
+            if len(parts) == self.CHUNK_LINES:
+                yield separator + "\n".join(parts)
+                parts.clear()
+                separator = "\n"
+        if parts:
+            yield separator + "\n".join(parts)
+
+    def generate_bulk(
+        self,
+        files_per_template: int,
+        sizes: Optional[SizeDistribution] = None,
+        templates: Optional[List[str]] = None,
+        seed: Union[int, str] = 0,
+        workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate files_per_template files for each template from a
+        process pool. Runs with the same seed produce identical files.
+
+        Returns a report with file count, bytes, elapsed time and MB/s.
+        """
+        sizes = sizes or SizeDistribution()
+        names = templates or list(self.templates)
+        for name in names:
+            if name not in self.templates:
+                raise ValueError(f"Unknown template: {name}")
+            (self.base_path / name).mkdir(parents=True, exist_ok=True)
+
+        start = time.perf_counter()
+        tasks = []
+        skipped = 0
+        # Shared by every file of the run; the index is part of the filename
+        params = f"seed={seed};sizes={sizes!r}"
+        for name in names:
+            version = self.template_version(name)
+            key = (name, version, params)
+            for index in range(files_per_template):
+                filename = f"{name}/{name}_{index:06d}.txt"
+                if self.incremental and self._is_current(filename, key):
+                    self.generated_files.append(filename)
+                    skipped += 1
+                    continue
+                entry = {
+                    "template": name,
+                    "template_version": version,
+                    "params": params,
+                    "seed": str(seed),
+                    "index": index,
+                }
+                tasks.append(
+                    (
+                        str(self.base_path),
+                        filename,
+                        entry,
+                        sizes,
+                        self.size_policy.max_chars,
+                        self.buffer_size,
+                    )
+                )
+
+        total_bytes = 0
+        failures = []
+        if tasks:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(
+                    1, len(tasks) // ((workers or os.cpu_count() or 1) * 4)
+                )
+                for filename, entry, error in executor.map(
+                    _generate_bulk_file, tasks, chunksize=chunksize
+                ):
+                    if error is None:
+                        self.generated_files.append(filename)
+                        self._record(filename, entry)
+                        total_bytes += entry["size"]
+                    else:
+                        failures.append((filename, error))
+            self.save_manifest()
+        elapsed = time.perf_counter() - start
+
+        report = {
+            "files": len(tasks) - len(failures),
+            "skipped": skipped,
+            "failed": failures,
+            "bytes": total_bytes,
+            "seconds": elapsed,
+            "mb_per_s": total_bytes / 2**20 / elapsed if elapsed else 0.0,
+        }
+        if self.verbose:
+            for filename, error in failures:
+                print(f"Failed to generate {filename}: {error}")
+            print(
+                f"Bulk generation: {report['files']} files, "
+                f"{total_bytes / 2**20:.1f} MB in {elapsed:.2f}s "
+                f"({report['mb_per_s']:.1f} MB/s), {skipped} up to date"
+            )
+        return report
 
     @handle_file_errors
     def generate_ancient_fragment(self) -> Optional[bool]:
         """Generate ancient fragment training file."""
         template = self.templates["ancient_fragment"]
-        content = self._format_content(template)
-        return self._write_file("ancient_fragment.txt", content)
+        return self._generate_fixture(
+            "ancient_fragment.txt",
+            "ancient_fragment",
+            lambda: self._iter_content(template),
+        )
 
     @handle_file_errors
     def generate_classified_data(self) -> Optional[bool]:
         """Generate classified data training file."""
         template = self.templates["classified_data"]
-        content = self._format_content(template)
-        return self._write_file("classified_data.txt", content)
+        return self._generate_fixture(
+            "classified_data.txt",
+            "classified_data",
+            lambda: self._iter_content(template),
+        )
 
     @handle_file_errors
     def generate_security_protocols(self) -> Optional[bool]:
         """Generate security protocols training file."""
         template = self.templates["security_protocols"]
-        content = self._format_content(template)
-        return self._write_file("security_protocols.txt", content)
+        return self._generate_fixture(
+            "security_protocols.txt",
+            "security_protocols",
+            lambda: self._iter_content(template),
+        )
 
     @handle_file_errors
     def generate_standard_archive(self) -> Optional[bool]:
         """Generate standard archive training file."""
         template = self.templates["standard_archive"]
-        content = self._format_content(template)
-        return self._write_file("standard_archive.txt", content)
+        return self._generate_fixture(
+            "standard_archive.txt",
+            "standard_archive",
+            lambda: self._iter_content(template),
+        )
 
     @handle_file_errors
     def generate_corrupted_archive(self) -> Optional[bool]:
         """Generate corrupted archive simulation file."""
         template = self.templates["corrupted_archive"]
-        content = self._format_content(template)
-        return self._write_file("corrupted_archive.txt", content)
+        return self._generate_fixture(
+            "corrupted_archive.txt",
+            "corrupted_archive",
+            lambda: self._iter_content(template),
+        )
 
     @handle_file_errors
     def generate_sample_json(self) -> Optional[bool]:
@@ -173,7 +660,7 @@ class ArchiveDataGenerator:
         sample_data = {
             "metadata": {
                 "version": "2.1.0",
-                "generated": datetime.now().isoformat(),
+                "generated": None,
                 "generator": "ArchiveDataGenerator",
             },
             "file_types": ["ancient_fragment", "classified_data", "standard_archive"],
@@ -204,12 +691,34 @@ class ArchiveDataGenerator:
         }
 
         try:
-            json_content = json.dumps(sample_data, indent=2, ensure_ascii=False)
-            return self._write_file("sample_data.json", json_content)
+            # The version covers everything but the timestamp, so an
+            # unchanged sample keeps its file (and timestamp) across runs
+            version = hashlib.blake2b(
+                json.dumps([GENERATOR_VERSION, sample_data], sort_keys=True).encode(),
+                digest_size=8,
+            ).hexdigest()
+            sample_data["metadata"]["generated"] = self._timestamp()
+
+            return self._generate_fixture(
+                "sample_data.json",
+                "sample_json",
+                lambda: json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(
+                    sample_data
+                ),
+                version,
+            )
         except (TypeError, ValueError) as e:
             print(f"Error serializing JSON data: {e}")
             return None
 
+    @staticmethod
+    def _timestamp() -> str:
+        """Generation time; SOURCE_DATE_EPOCH pins it for reproducible runs."""
+        epoch = os.environ.get("SOURCE_DATE_EPOCH")
+        if epoch:
+            return datetime.fromtimestamp(int(epoch), timezone.utc).isoformat()
+        return datetime.now().isoformat()
+
     def generate_all_files(self) -> Dict[str, bool]:
         """Generate all training files and return success status."""
         print("=== CYBER ARCHIVES - DATA GENERATOR ===")
@@ -239,6 +748,11 @@ class ArchiveDataGenerator:
                 print(f"Failed to generate {description}: {e}")
                 results[generator_func.__name__] = False
 
+        try:
+            self.save_manifest()
+        except OSError as e:
+            print(f"Warning: Could not write manifest: {e}")
+
         print()
         print(
             f"Generation complete: {successful}/{len(generators)} "
@@ -275,11 +789,69 @@ class ArchiveDataGenerator:
 
 def main() -> None:
     """Main entry point with command-line argument handling."""
+    parser = argparse.ArgumentParser(description="Cyber Archives data generator")
+    parser.add_argument("base_path", nargs="?", help="Output directory")
+    parser.add_argument(
+        "--bulk", type=int, metavar="N", help="Generate N files per template"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="fixed:4KB",
+        help="Bulk size distribution, e.g. fixed:1MB, uniform:1KB-10MB, "
+        "lognormal:1MB,1.5",
+    )
+    parser.add_argument(
+        "--template", action="append", help="Limit bulk mode to a template"
+    )
+    parser.add_argument("--seed", default="0", help="Bulk generation seed")
+    parser.add_argument("--workers", type=int, help="Bulk or verify worker processes")
+    parser.add_argument(
+        "--force", action="store_true", help="Regenerate files that are up to date"
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check generated files against the manifest hashes",
+    )
+    parser.add_argument(
+        "--buffer-size",
+        default="1MB",
+        help="Write buffer size per file, e.g. 64KB or 8MB",
+    )
+    parser.add_argument(
+        "--max-size",
+        help="Per-file size limit, e.g. 10000 or 4GB ('none' disables it)",
+    )
+    args = parser.parse_args()
+
     try:
-        # Check for optional base path argument
-        base_path = sys.argv[1] if len(sys.argv) > 1 else None
+        if args.max_size is None:
+            # The fixed fixtures keep the historical 10000 character limit
+            policy = SizePolicy(None) if args.bulk else SizePolicy()
+        elif args.max_size.lower() == "none":
+            policy = SizePolicy(None)
+        else:
+            policy = SizePolicy(parse_size(args.max_size))
+
+        generator = ArchiveDataGenerator(
+            args.base_path,
+            policy,
+            buffer_size=parse_size(args.buffer_size),
+            incremental=not args.force,
+        )
+        if args.verify:
+            report = generator.verify(args.workers)
+            sys.exit(1 if report["failed"] else 0)
+        if args.bulk:
+            report = generator.generate_bulk(
+                args.bulk,
+                SizeDistribution.parse(args.sizes),
+                args.template,
+                args.seed,
+                args.workers,
+            )
+            sys.exit(1 if report["failed"] else 0)
 
-        generator = ArchiveDataGenerator(base_path)
         results = generator.generate_all_files()
 
         # Exit with appropriate code based on results
@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from stream_processor import LogProcessor
+
+MESSAGES = [
+    "INFO: request served in {n} ms",
+    "DEBUG: cache lookup key={n}",
+    "WARNING: high latency on node {n}",
+    "ERROR: connection timeout to db-{n}",
+    "INFO: user {n} logged in",
+    "ERROR: disk full on /var/{n}",
+]
+
+
+def generate_log(path: str, size: int) -> None:
+    """Escribe un log de unos size bytes repitiendo un bloque de ~1 MiB."""
+    rng = random.Random(42)
+    lines = []
+    block_size = 0
+    while block_size < 1 << 20:
+        line = "2024-01-01 12:00:00 " + rng.choice(MESSAGES).format(n=rng.randrange(50)) + "\n"
+        lines.append(line)
+        block_size += len(line)
+    block = "".join(lines).encode()
+    with open(path, "wb") as handle:
+        for _ in range(max(1, size // len(block))):
+            handle.write(block)
+
+
+def line_by_line(processor: LogProcessor, path: str) -> int:
+    """Ruta anterior, como referencia: validate + process por línea."""
+    processed = 0
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if processor.validate(line):
+                processor.process(line)
+            processed += 1
+    return processed
+
+
+def main():
+    size_mib = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    baseline_mib = min(size_mib, 64)
+    print("=== CODE NEXUS - LOG BENCHMARK ===")
+    processor = LogProcessor()
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "nexus.log")
+        alerts_path = os.path.join(directory, "alerts.log")
+
+        generate_log(log_path, baseline_mib << 20)
+        start = time.perf_counter()
+        lines = line_by_line(processor, log_path)
+        elapsed = time.perf_counter() - start
+        print(f"line by line     {baseline_mib:>6} MiB  {lines:>12,} lines  "
+              f"{elapsed:8.3f}s  {baseline_mib / 1024 / elapsed:6.3f} GiB/s")
+
+        generate_log(log_path, size_mib << 20)
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            result = processor.process_file(log_path, alerts_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            gib = result["bytes"] / 2**30
+            print(f"process_file x{workers:<3} {size_mib:>6} MiB  {result['lines']:>12,} lines  "
+                  f"{elapsed:8.3f}s  {gib / elapsed:6.3f} GiB/s")
+        print(f"    levels: {result['levels']}")
+        for level, message, count in result["top_messages"][:5]:
+            print(f"    {count:>10,}  {level:<7} {message}")
+        print(f"    alerts written: {os.path.getsize(alerts_path) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import random
+import sys
+import time
+from array import array
+
+from stream_processor import NumericProcessor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def report(label: str, validate: float, process: float) -> None:
+    print(f"{label:<20} validate {validate:9.4f}s  process {process:8.3f}s")
+
+
+def bench(label: str, processor: NumericProcessor, data) -> None:
+    start = time.perf_counter()
+    valid = processor.validate(data)
+    validate = time.perf_counter() - start
+    if not valid:
+        print(f"{label:<20} rejected")
+        return
+    start = time.perf_counter()
+    result = processor.process(data)
+    report(label, validate, time.perf_counter() - start)
+    quantiles = ", ".join(f"p{int(q * 100)}={v:.2f}" for q, v in result["quantiles"].items())
+    print(
+        f"    mean={result['average']:.4f} stddev={result['stddev']:.4f} "
+        f"min={result['min']} max={result['max']} {quantiles}"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    print("=== CODE NEXUS - NUMERIC BENCHMARK ===")
+    rng = random.Random(42)
+    values = [rng.random() * 100 for _ in range(count)]
+    processor = NumericProcessor()
+
+    bench("list[float]", processor, values)
+    typed = array("d", values)
+    del values
+    bench("array('d')", processor, typed)
+    bench("memoryview", processor, memoryview(typed))
+    if np is not None:
+        bench("numpy.ndarray", processor, np.frombuffer(typed, dtype=np.float64))
+    else:
+        print("numpy.ndarray        skipped (numpy not installed)")
+
+
+if __name__ == "__main__":
+    main()
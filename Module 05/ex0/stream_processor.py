@@ -1,5 +1,110 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Union
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, repeat
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import math
+import mmap
+import operator
+import os
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Tamaño de la muestra que acota las posiciones buscadas en _order_statistics
+_SELECT_SAMPLE = 1 << 15
+# Elementos a partir de los cuales execute() resume la entrada
+_PREVIEW_ITEMS = 100
+
+
+def _order_statistics(values: Sequence[float], ranks: Iterable[int]) -> Dict[int, float]:
+    """
+    Valores en las posiciones ranks del orden ascendente sin ordenar una
+    copia de values: una muestra ordenada acota cada posición y solo se
+    ordena la franja de valores entre las dos cotas.
+    """
+    count = len(values)
+    ranks = sorted(set(ranks))
+    if count <= 4 * _SELECT_SAMPLE:
+        ordered = sorted(values)
+        return {rank: ordered[rank] for rank in ranks}
+    sample = sorted(values[::count // _SELECT_SAMPLE])
+    margin = 3 * math.isqrt(len(sample))
+    found = {}
+    for rank in ranks:
+        if rank in found:
+            continue
+        position = rank * len(sample) // count
+        low = sample[position - margin] if position >= margin else -math.inf
+        high = (
+            sample[position + margin]
+            if position + margin < len(sample)
+            else math.inf
+        )
+        # operator.* y no low.__gt__: int.__gt__(float) da NotImplemented
+        below = sum(map(operator.lt, values, repeat(low)))
+        inside = map(
+            operator.and_,
+            map(operator.ge, values, repeat(low)),
+            map(operator.le, values, repeat(high)),
+        )
+        band = sorted(compress(values, inside))
+        for other in ranks:
+            if below <= other < below + len(band):
+                found[other] = band[other - below]
+        if rank not in found:
+            # La muestra no acotó la posición: se ordena todo
+            ordered = sorted(values)
+            return {rank: ordered[rank] for rank in ranks}
+    return found
+
+
+def _percentiles(values: Sequence[float], quantiles: Sequence[float]) -> List[float]:
+    """Percentiles q (0-1) con interpolación lineal entre posiciones vecinas."""
+    last = len(values) - 1
+    positions = [last * q for q in quantiles]
+    ranks = []
+    for position in positions:
+        lower = math.floor(position)
+        ranks += [lower, min(lower + 1, last)]
+    found = _order_statistics(values, ranks)
+    results = []
+    for position in positions:
+        lower = math.floor(position)
+        weight = position - lower
+        upper = found[min(lower + 1, last)]
+        results.append(found[lower] * (1 - weight) + upper * weight)
+    return results
+
+
+def _describe(data: Any) -> str:
+    """Texto de la entrada para execute(); los buffers grandes se resumen."""
+    if isinstance(data, str):
+        return f'"{data}"'
+    try:
+        size = len(data)
+    except TypeError:
+        return f"{data}"
+    if size <= _PREVIEW_ITEMS:
+        return f"{data}"
+    return f"<{type(data).__name__} of {size} items>"
 
 
 class DataProcessor(ABC):
@@ -9,19 +114,16 @@ class DataProcessor(ABC):
         pass
 
     @abstractmethod
-    def process(self, data: Any) -> str:
+    def process(self, data: Any) -> Any:
         pass
 
     @abstractmethod
-    def format_output(self, processed_result: str) -> str:
+    def format_output(self, processed_result: Any) -> str:
         pass
 
     def execute(self, data: Any) -> str:
         try:
-            if isinstance(data, str):
-                print(f'Processing data: "{data}"')
-            else:
-                print(f"Processing data: {data}")
+            print(f"Processing data: {_describe(data)}")
             if self.validate(data):
                 print(f"Validation: {self._get_validation_message()}")
 
@@ -46,24 +148,76 @@ class DataProcessor(ABC):
 
 
 class NumericProcessor(DataProcessor):
+    # Códigos de tipo numéricos de array y memoryview
+    NUMERIC_TYPECODES = frozenset("bBhHiIlLqQnNfd")
+    QUANTILES = (0.25, 0.5, 0.75)
+
     def __init__(self):
         pass
 
     def validate(self, data: Any) -> bool:
+        # Los buffers tipados se validan por su tipo, sin recorrerlos
+        if isinstance(data, array):
+            return len(data) > 0 and data.typecode in self.NUMERIC_TYPECODES
+        if isinstance(data, memoryview):
+            return (
+                data.ndim == 1
+                and len(data) > 0
+                and data.format.lstrip("@=<>!") in self.NUMERIC_TYPECODES
+            )
+        if np is not None and isinstance(data, np.ndarray):
+            return (
+                data.ndim == 1 and data.size > 0 and data.dtype.kind in "iuf"
+            )
         if not isinstance(data, (list, tuple)):
             return False
         if not data:
             return False
         return all(isinstance(x, (int, float)) for x in data)
 
-    def process(self, data: List[Union[int, float]]) -> str:
+    def process(
+        self, data: Union[List[Union[int, float]], array, memoryview]
+    ) -> Dict[str, Any]:
+        if np is not None and isinstance(data, np.ndarray):
+            return self._process_ndarray(data)
         count = len(data)
         total = sum(data)
         average = total / count
-        return f"{count},{total},{average}"
-
-    def format_output(self, processed_result: str) -> str:
-        count, total, avg = processed_result.split(",")
+        # Desviaciones respecto a la media: E[x²] - media² cancela
+        # catastróficamente con valores grandes y poco dispersos
+        deviations = map(operator.sub, data, repeat(average))
+        variance = math.fsum(map(operator.pow, deviations, repeat(2))) / count
+        # Selección en lugar de sorted(): no se crea una lista ordenada
+        # con todos los valores
+        quantiles = _percentiles(data, self.QUANTILES)
+        return {
+            "count": count,
+            "total": total,
+            "average": average,
+            "stddev": math.sqrt(variance),
+            "min": min(data),
+            "max": max(data),
+            "quantiles": dict(zip(self.QUANTILES, quantiles)),
+        }
+
+    def _process_ndarray(self, data: Any) -> Dict[str, Any]:
+        count = int(data.size)
+        total = data.sum().item()
+        quantiles = np.quantile(data, self.QUANTILES)
+        return {
+            "count": count,
+            "total": total,
+            "average": total / count,
+            "stddev": float(data.std()),
+            "min": data.min().item(),
+            "max": data.max().item(),
+            "quantiles": dict(zip(self.QUANTILES, quantiles.tolist())),
+        }
+
+    def format_output(self, processed_result: Dict[str, Any]) -> str:
+        count = processed_result["count"]
+        total = processed_result["total"]
+        avg = processed_result["average"]
         return f"Processed {count} numeric values, sum={total}, avg={avg}"
 
     def _get_validation_message(self) -> str:
@@ -90,21 +244,88 @@ class TextProcessor(DataProcessor):
         return "Text data verified"
 
 
+def _level_variants(level: str) -> List[bytes]:
+    return [
+        level.encode(), level.capitalize().encode(), level.lower().encode()
+    ]
+
+
+def _scan_log_range(
+    path: str, start: int, end: int, collect_alerts: bool
+) -> Tuple[int, Counter, Counter, List[bytes]]:
+    """Procesa el bloque [start, end) de un log (para workers)."""
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        chunk = handle.read(end - start)
+    counts = Counter()
+    messages = Counter()
+    alerts = LogProcessor()._scan_chunk(
+        chunk, counts, messages, collect_alerts
+    )
+    # Solo el último bloque puede acabar sin salto de línea
+    lines = chunk.count(b"\n") + (not chunk.endswith(b"\n"))
+    return lines, counts, messages, alerts
+
+
+def _chunk_bounds(
+    mapped: mmap.mmap, size: int, chunk_size: int
+) -> Iterator[Tuple[int, int]]:
+    """Cortes [start, end) de unos chunk_size bytes en saltos de línea."""
+    position = 0
+    while position < size:
+        stop = min(position + chunk_size, size)
+        if stop < size:
+            cut = mapped.rfind(b"\n", position, stop) + 1
+            if cut > position:
+                stop = cut
+            else:
+                stop = mapped.find(b"\n", stop) + 1 or size
+        yield position, stop
+        position = stop
+
+
 class LogProcessor(DataProcessor):
+    LEVELS = ("ERROR", "WARNING", "INFO", "DEBUG")
+    LEVEL_KEYS = tuple(level.encode() for level in LEVELS)
+    # Regla de process_file() (process() conserva su comportamiento
+    # original): en una línea gana el nivel de mayor precedencia
+    # (ERROR > WARNING > INFO > DEBUG) sin distinguir mayúsculas, y el
+    # mensaje sigue a los ':' tras ese nivel, o al propio nivel si no
+    # hay ':'.
+    LEVEL_RULE = (
+        rb"(?:.*?(ERROR)|.*?(WARNING)|.*?(INFO)|.*?(DEBUG))"
+        rb"(?:[^:\n]*:)?[ \t]*([^\n]*)"
+    )
+    LEVEL_PRECEDENCE = re.compile(
+        rb"^" + LEVEL_RULE, re.IGNORECASE | re.MULTILINE
+    )
+    # Pasada rápida por bloque: (nivel, mensaje) de la primera aparición
+    # de una variante habitual de nivel en cada línea. Las variantes
+    # explícitas son bastante más rápidas que la regla completa.
+    LEVEL_VARIANTS = {level: _level_variants(level) for level in LEVELS}
+    LEVEL_LINE = re.compile(
+        rb"("
+        + b"|".join(sum(LEVEL_VARIANTS.values(), []))
+        + rb")(?:[^:\n]*:)?[ \t]*([^\n]*)"
+    )
+    ERROR_VARIANTS = frozenset(LEVEL_VARIANTS["ERROR"])
+    CHUNK_SIZE = 8 << 20
+    # Mensajes distintos que se cuentan antes de descartar los menos vistos
+    MAX_TRACKED_MESSAGES = 10_000
+
     def __init__(self):
         pass
 
     def validate(self, data: Any) -> bool:
         if not isinstance(data, str):
             return False
-        log_levels = ["ERROR", "WARNING", "INFO", "DEBUG"]
-        return any(level in data.upper() for level in log_levels)
+        return any(level in data.upper() for level in self.LEVELS)
 
     def process(self, data: str) -> str:
         data_upper = data.upper()
 
         level = None
-        for log_level in ["ERROR", "WARNING", "INFO", "DEBUG"]:
+        for log_level in self.LEVELS:
             if log_level in data_upper:
                 level = log_level
                 break
@@ -124,6 +345,174 @@ class LogProcessor(DataProcessor):
         else:
             return f"[{level}] {level} level detected: {message}"
 
+    def process_file(
+        self,
+        path: str,
+        alerts_path: Optional[str] = None,
+        top: int = 10,
+        chunk_size: int = CHUNK_SIZE,
+        workers: int = 1,
+        progress: Optional[Callable[[int, Dict[str, int]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Procesa un fichero de log por bloques grandes con una sola
+        expresión regular precompilada por bloque. Los bloques se cortan
+        en el último salto de línea; el resto pasa al bloque siguiente.
+        Con workers > 1 los bloques se reparten entre procesos, y sus
+        resultados se combinan y escriben en orden a medida que llegan.
+
+        Args:
+            path: Fichero de log
+            alerts_path: Fichero donde escribir las alertas ERROR al vuelo
+            top: Número de mensajes más frecuentes a retornar
+            chunk_size: Bytes leídos por bloque
+            workers: Procesos que reparten el fichero
+            progress: Función llamada con (bytes, conteos) tras cada bloque
+
+        Returns:
+            Líneas, bytes, conteo por nivel y mensajes más frecuentes
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        counts = Counter()
+        messages = Counter()
+        lines = 0
+        size = 0
+        alerts = open(alerts_path, "wb") if alerts_path else None
+        collect_alerts = alerts is not None
+        try:
+            if workers == 1:
+                parts = self._scan_sequential(path, chunk_size, collect_alerts)
+            else:
+                parts = self._scan_parallel(
+                    path, chunk_size, workers, collect_alerts
+                )
+            for (
+                part_bytes, part_lines, part_counts, part_messages, part_alerts
+            ) in parts:
+                lines += part_lines
+                size += part_bytes
+                counts.update(part_counts)
+                messages.update(part_messages)
+                self._prune(messages)
+                if alerts is not None:
+                    alerts.writelines(
+                        b"[ALERT] ERROR level detected: "
+                        + message.rstrip()
+                        + b"\n"
+                        for message in part_alerts
+                    )
+                if progress is not None:
+                    progress(size, self._level_counts(counts))
+        finally:
+            if alerts is not None:
+                alerts.close()
+
+        merged = Counter()
+        for (level, message), count in messages.items():
+            merged[level.upper(), message.rstrip()] += count
+        return {
+            "lines": lines,
+            "bytes": size,
+            "levels": self._level_counts(counts),
+            "top_messages": [
+                (level.decode(), message.decode("utf-8", "replace"), count)
+                for (level, message), count in merged.most_common(top)
+            ],
+        }
+
+    def _scan_sequential(
+        self, path: str, chunk_size: int, collect_alerts: bool
+    ) -> Iterator[Tuple[int, int, Counter, Counter, List[bytes]]]:
+        with open(path, "rb") as handle:
+            tail = b""
+            while True:
+                block = handle.read(chunk_size)
+                if not block:
+                    break
+                if tail:
+                    block = tail + block
+                cut = block.rfind(b"\n") + 1
+                if not cut:
+                    tail = block
+                    continue
+                chunk, tail = block[:cut], block[cut:]
+                counts = Counter()
+                messages = Counter()
+                alerts = self._scan_chunk(
+                    chunk, counts, messages, collect_alerts
+                )
+                yield cut, chunk.count(b"\n"), counts, messages, alerts
+            if tail:
+                counts = Counter()
+                messages = Counter()
+                alerts = self._scan_chunk(
+                    tail, counts, messages, collect_alerts
+                )
+                yield len(tail), 1, counts, messages, alerts
+
+    def _scan_parallel(
+        self, path: str, chunk_size: int, workers: int, collect_alerts: bool
+    ) -> Iterator[Tuple[int, int, Counter, Counter, List[bytes]]]:
+        size = os.path.getsize(path)
+        if not size:
+            return
+        with open(path, "rb") as handle, mmap.mmap(
+            handle.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped, ProcessPoolExecutor(max_workers=workers) as executor:
+            # Pocos bloques en vuelo: las alertas y los conteos se
+            # entregan en orden sin acumular el fichero entero
+            pending = deque()
+            for start, end in _chunk_bounds(mapped, size, chunk_size):
+                future = executor.submit(
+                    _scan_log_range, path, start, end, collect_alerts
+                )
+                pending.append((end - start, future))
+                if len(pending) > 2 * workers:
+                    part_bytes, future = pending.popleft()
+                    yield (part_bytes, *future.result())
+            for part_bytes, future in pending:
+                yield (part_bytes, *future.result())
+
+    def _scan_chunk(
+        self,
+        chunk: bytes,
+        counts: Counter,
+        messages: Counter,
+        collect_alerts: bool,
+    ) -> List[bytes]:
+        matches = self.LEVEL_LINE.findall(chunk)
+        occurrences = sum(map(chunk.upper().count, self.LEVEL_KEYS))
+        if len(matches) != occurrences:
+            # Solo coinciden si cada línea con nivel tiene uno solo y en
+            # una variante habitual. Si no, se repasa el bloque con la
+            # regla completa.
+            matches = [
+                ((error or warning or info or debug).upper(), message)
+                for error, warning, info, debug, message
+                in self.LEVEL_PRECEDENCE.findall(chunk)
+            ]
+        counts.update(map(itemgetter(0), matches))
+        messages.update(matches)
+        self._prune(messages)
+        if not collect_alerts:
+            return []
+        errors = self.ERROR_VARIANTS
+        return [message for level, message in matches if level in errors]
+
+    def _prune(self, messages: Counter) -> None:
+        # Conteo aproximado y acotado: se conservan los más frecuentes
+        if len(messages) > 2 * self.MAX_TRACKED_MESSAGES:
+            kept = messages.most_common(self.MAX_TRACKED_MESSAGES)
+            messages.clear()
+            messages.update(dict(kept))
+
+    def _level_counts(self, counts: Counter) -> Dict[str, int]:
+        return {
+            level: sum(counts[variant] for variant in variants)
+            for level, variants in self.LEVEL_VARIANTS.items()
+        }
+
     def _get_validation_message(self) -> str:
         return "Log entry verified"
 
@@ -1,18 +1,568 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import abc, deque
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from itertools import chain, compress, filterfalse, islice, repeat
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+import glob
+import json
+import math
+import mmap
+import operator
+import os
+import re
+import struct
+import sys
+import time
+
+
+# Tamaño de la muestra que acota las posiciones buscadas en _order_statistics
+_SELECT_SAMPLE = 1 << 15
+
+
+def _order_statistics(values: Sequence[float], ranks: Iterable[int]) -> Dict[int, float]:
+    """
+    Valores en las posiciones ranks del orden ascendente sin ordenar una
+    copia de values: una muestra ordenada acota cada posición y solo se
+    ordena la franja de valores entre las dos cotas.
+    """
+    return _chunked_order_statistics(lambda: (values,), len(values), ranks)
+
+
+def _chunked_order_statistics(
+    chunks: Callable[[], Iterable[Sequence[float]]], count: int, ranks: Iterable[int]
+) -> Dict[int, float]:
+    """
+    _order_statistics sobre count valores repartidos en bloques. chunks()
+    los recorre de nuevo en cada pasada, así que la muestra y las franjas
+    se reúnen bloque a bloque sin tener todos los valores a la vez.
+    """
+    ranks = sorted(set(ranks))
+    if count <= 4 * _SELECT_SAMPLE:
+        ordered = sorted(chain.from_iterable(chunks()))
+        return {rank: ordered[rank] for rank in ranks}
+    step = count // _SELECT_SAMPLE
+    sample = sorted(chain.from_iterable(chunk[::step] for chunk in chunks()))
+    margin = 3 * math.isqrt(len(sample))
+    # Cotas de cada posición; las posiciones vecinas comparten franja
+    bounds = {}
+    for rank in ranks:
+        position = rank * len(sample) // count
+        low = sample[position - margin] if position >= margin else -math.inf
+        high = (
+            sample[position + margin]
+            if position + margin < len(sample)
+            else math.inf
+        )
+        bounds.setdefault((low, high), []).append(rank)
+    # Una sola pasada por los bloques reúne todas las franjas
+    below = dict.fromkeys(bounds, 0)
+    bands = {bound: [] for bound in bounds}
+    for values in chunks():
+        for low, high in bounds:
+            # operator.* y no low.__gt__: int.__gt__(float) da NotImplemented
+            below[low, high] += sum(map(operator.lt, values, repeat(low)))
+            inside = map(
+                operator.and_,
+                map(operator.ge, values, repeat(low)),
+                map(operator.le, values, repeat(high)),
+            )
+            bands[low, high].extend(compress(values, inside))
+    found = {}
+    for bound, bound_ranks in bounds.items():
+        band = sorted(bands.pop(bound))
+        for rank in bound_ranks:
+            if not below[bound] <= rank < below[bound] + len(band):
+                # La muestra no acotó la posición: se ordena todo
+                ordered = sorted(chain.from_iterable(chunks()))
+                return {rank: ordered[rank] for rank in ranks}
+            found[rank] = band[rank - below[bound]]
+    return found
+
+
+def _percentiles(values: Sequence[float], quantiles: Sequence[float]) -> List[float]:
+    """Percentiles q (0-1) con interpolación lineal entre posiciones vecinas."""
+    return _chunked_percentiles(lambda: (values,), len(values), quantiles)
+
+
+def _chunked_percentiles(
+    chunks: Callable[[], Iterable[Sequence[float]]],
+    count: int,
+    quantiles: Sequence[float],
+) -> List[float]:
+    """_percentiles sobre count valores repartidos en bloques."""
+    last = count - 1
+    positions = [last * q for q in quantiles]
+    ranks = []
+    for position in positions:
+        lower = math.floor(position)
+        ranks += [lower, min(lower + 1, last)]
+    found = _chunked_order_statistics(chunks, count, ranks)
+    results = []
+    for position in positions:
+        lower = math.floor(position)
+        weight = position - lower
+        upper = found[min(lower + 1, last)]
+        results.append(found[lower] * (1 - weight) + upper * weight)
+    return results
+
+
+def summarize_readings(readings: Sequence[float]) -> Dict[str, float]:
+    """
+    Resume un buffer numérico: media, mínimo, máximo, desviación típica
+    y percentiles. La varianza se calcula en dos pasadas (RunningStats)
+    y los percentiles sin convertir el buffer tipado en una lista.
+    """
+    return summarize_chunks(lambda: (readings,))
+
+
+def summarize_chunks(
+    chunks: Callable[[], Iterable[Sequence[float]]]
+) -> Dict[str, float]:
+    """
+    summarize_readings sobre valores repartidos en bloques; chunks() se
+    recorre varias veces y solo hace falta un bloque en memoria a la vez.
+    """
+    stats = RunningStats()
+    for values in chunks():
+        stats.update_many(values)
+    if not stats.count:
+        return {"count": 0}
+    summary = stats.get_summary()
+    p50, p95, p99 = _chunked_percentiles(chunks, stats.count, (0.50, 0.95, 0.99))
+    summary.update(p50=p50, p95=p95, p99=p99)
+    return summary
+
+
+class RunningStats:
+    """
+    Agregados incrementales actualizados una vez por valor: suma, media y
+    varianza de Welford, mínimo y máximo. Todas las consultas son O(1);
+    tras retirar un extremo se recalculan con extrema_source().
+    """
+
+    def __init__(self, extrema_source: Optional[Callable[[], Iterable]] = None):
+        self.extrema_source = extrema_source
+        self.count = 0
+        # Suma secuencial: la media coincide con sum(valores) / count
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self._extrema_stale = False
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def update_many(self, values: Sequence[float]) -> None:
+        """
+        Añade un bloque de valores de una vez: los agregados del bloque se
+        calculan con funciones nativas y se combinan (Chan et al.).
+        """
+        count = len(values)
+        if not count:
+            return
+        total = sum(values)
+        mean = total / count
+        deviations = array("d", map(operator.sub, values, repeat(mean)))
+        m2 = math.fsum(map(operator.mul, deviations, deviations))
+        combined = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / combined
+        self.m2 += m2 + delta * delta * self.count * count / combined
+        self.count = combined
+        self.total += total
+        low, high = min(values), max(values)
+        if self.minimum is None or low < self.minimum:
+            self.minimum = low
+        if self.maximum is None or high > self.maximum:
+            self.maximum = high
+
+    def remove(self, value: float) -> None:
+        """Retira un valor previamente añadido (Welford inverso)."""
+        if self.count <= 1:
+            self.__init__(self.extrema_source)
+            return
+        self.total -= value
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (value - self.mean), 0.0)
+        if value == self.minimum or value == self.maximum:
+            self._extrema_stale = True
+
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def get_summary(self) -> Dict[str, float]:
+        if self._extrema_stale and self.extrema_source is not None:
+            values = list(self.extrema_source())
+            self.minimum = min(values, default=None)
+            self.maximum = max(values, default=None)
+            self._extrema_stale = False
+        return {
+            "count": self.count,
+            "mean": self.average(),
+            "min": self.minimum,
+            "max": self.maximum,
+            "stddev": math.sqrt(self.variance()),
+        }
+
+
+class BatchResult:
+    """
+    Resultado de process_batch. Guarda una referencia al lote y solo
+    construye su representación de texto cuando se llama a str().
+    """
+
+    __slots__ = ("batch", "_rendered")
+
+    def __init__(self, batch: List[Any]):
+        self.batch = batch
+        self._rendered = None
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    def _render(self) -> str:
+        parts = []
+        for item in self.batch:
+            if isinstance(item, dict):
+                parts.append(", ".join(f"{k}:{v}" for k, v in item.items()))
+            else:
+                parts.append(str(item))
+        return "[" + ", ".join(parts) + "]"
+
+    def __str__(self) -> str:
+        if self._rendered is None:
+            self._rendered = self._render()
+        return self._rendered
+
+    def __repr__(self) -> str:
+        return f"BatchResult({len(self.batch)} items)"
+
+
+class RetentionPolicy:
+    """
+    Política de retención de un DataStream. Decide qué registros siguen
+    en la ventana; los expulsados salen siempre por el más antiguo.
+    Guarda estado de ventana, así que cada flujo necesita su instancia.
+    """
+
+    keeps_items = True
+    timed = False
+
+    def starts_new_window(self, now: float) -> bool:
+        """True si la ventana actual termina y debe vaciarse."""
+        return False
+
+    def excess(self, size: int, arrivals: Deque[float], now: float) -> int:
+        """Número de registros antiguos que deben expulsarse."""
+        return 0
+
+    def new_buffer(self):
+        return deque()
+
+
+class KeepAll(RetentionPolicy):
+    """Retención ilimitada: se conserva toda la historia."""
+
+    def new_buffer(self):
+        return []
+
+
+class CountWindow(RetentionPolicy):
+    """Buffer circular con los últimos max_items registros."""
+
+    def __init__(self, max_items: int):
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        self.max_items = max_items
+
+    def excess(self, size: int, arrivals: Deque[float], now: float) -> int:
+        return max(0, size - self.max_items)
+
+
+class TumblingWindow(RetentionPolicy):
+    """Ventanas consecutivas de duración fija que no se solapan."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        if seconds <= 0:
+            raise ValueError("seconds must be positive")
+        self.seconds = seconds
+        self.clock = clock
+        self.window_start = None
+
+    def starts_new_window(self, now: float) -> bool:
+        if self.window_start is None:
+            self.window_start = now
+            return False
+        if now - self.window_start < self.seconds:
+            return False
+        self.window_start = now - (now - self.window_start) % self.seconds
+        return True
+
+
+class SlidingWindow(RetentionPolicy):
+    """Ventana deslizante con los registros de los últimos segundos."""
+
+    timed = True
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        if seconds <= 0:
+            raise ValueError("seconds must be positive")
+        self.seconds = seconds
+        self.clock = clock
+
+    def excess(self, size: int, arrivals: Deque[float], now: float) -> int:
+        cutoff = now - self.seconds
+        expired = 0
+        for arrival in arrivals:
+            if arrival > cutoff:
+                break
+            expired += 1
+        return expired
+
+
+class SummariesOnly(RetentionPolicy):
+    """No conserva registros, solo los agregados acumulados."""
+
+    keeps_items = False
+
+    def new_buffer(self):
+        return []
+
+
+# Cabecera de segmento: formato, registros, columnas y valores sueltos
+# (16 bytes). El cuerpo guarda las columnas float64 alineadas con los
+# registros, los valores sueltos en float64 y cada registro completo con
+# longitud prefijada, en ese orden.
+_SEGMENT_HEADER = struct.Struct("<4sIHxxI")
+_COLUMNAR_SEGMENT = b"NXSC"
+# Segmento de eventos: los valores sueltos son las posiciones de los
+# registros de error, así que la cabecera ya da cuántos hay
+_EVENT_SEGMENT = b"NXSE"
+_LENGTH_PREFIX = struct.Struct("<I")
+# Primer byte de cada registro: cadena UTF-8 tal cual o JSON
+_TEXT_RECORD = ord("s")
+# Un único codificador: json.dumps con opciones crea uno por llamada
+_encode_json = json.JSONEncoder(ensure_ascii=False, default=repr).encode
+_decode_json = json.JSONDecoder().decode
+
+
+def _integral(value: float) -> Any:
+    """Devuelve como int los importes enteros leídos de un segmento."""
+    return int(value) if value.is_integer() else value
+
+
+def _segment_paths(directory: str, prefix: str) -> List[str]:
+    pattern = os.path.join(glob.escape(directory), glob.escape(prefix) + ".*.seg")
+    return sorted(glob.glob(pattern))
+
+
+def _number_field(record: Dict[str, Any], field: str) -> float:
+    """Valor de un campo que debe ser numérico (TypeError si no lo es)."""
+    value = record[field]
+    if not isinstance(value, (int, float)):
+        raise TypeError(f"{field} must be a number, not {type(value).__name__}")
+    return value
+
+
+def _numeric_column(items: List[Any], field: str) -> array:
+    """Columna float64 de un campo; ausente o no numérico se guarda como NaN."""
+    column = array("d")
+    for item in items:
+        value = item.get(field) if isinstance(item, dict) else None
+        column.append(value if isinstance(value, (int, float)) else math.nan)
+    return column
+
+
+def _encode_record(item: Any) -> bytes:
+    """
+    Registro completo: las cadenas van tal cual y el resto como JSON; los
+    valores que JSON no representa se guardan con repr().
+    """
+    if isinstance(item, str):
+        return b"s" + item.encode("utf-8")
+    return b"j" + _encode_json(item).encode("utf-8")
+
+
+def _decode_record(raw: memoryview) -> Any:
+    text = str(raw[1:], "utf-8")
+    return text if raw[0] == _TEXT_RECORD else _decode_json(text)
+
+
+def _encode_segment(
+    kind: bytes,
+    items: List[Any],
+    columns: Sequence[array] = (),
+    values: Optional[array] = None,
+) -> bytes:
+    values = values if values is not None else array("d")
+    parts = [_SEGMENT_HEADER.pack(kind, len(items), len(columns), len(values))]
+    parts.extend(column.tobytes() for column in columns)
+    parts.append(values.tobytes())
+    for item in items:
+        data = _encode_record(item)
+        parts.append(_LENGTH_PREFIX.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+class _SegmentView:
+    """Vista sin copia del cuerpo de un segmento proyectado con mmap."""
+
+    def __init__(self, count: int, columns: int, values: int, body: memoryview):
+        self.count = count
+        self.columns = columns
+        self.values = values
+        self.body = body
+
+    @contextmanager
+    def column(self, index: int) -> Iterator[memoryview]:
+        """Columna float64 index, alineada con los registros."""
+        width = self.count * 8
+        with self.body[index * width:(index + 1) * width] as raw, raw.cast(
+            "d"
+        ) as column:
+            yield column
+
+    @contextmanager
+    def loose_values(self) -> Iterator[memoryview]:
+        """Valores float64 sueltos, sin correspondencia con los registros."""
+        start = self.columns * self.count * 8
+        with self.body[start:start + self.values * 8] as raw, raw.cast(
+            "d"
+        ) as values:
+            yield values
+
+    def records(self) -> Iterator[memoryview]:
+        """Registros codificados, como vistas sin copia."""
+        body = self.body
+        offset = (self.columns * self.count + self.values) * 8
+        for _ in range(self.count):
+            (length,) = _LENGTH_PREFIX.unpack_from(body, offset)
+            offset += _LENGTH_PREFIX.size
+            yield body[offset:offset + length]
+            offset += length
+
+
+@contextmanager
+def _open_segment(path: str, kind: bytes) -> Iterator[_SegmentView]:
+    """Proyecta un segmento en memoria con mmap."""
+    with open(path, "rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped, memoryview(mapped) as view:
+        magic, count, columns, values = _SEGMENT_HEADER.unpack_from(view)
+        if magic != kind:
+            raise ValueError(f"{path} is not a {kind.decode()} segment")
+        with view[_SEGMENT_HEADER.size:] as body:
+            yield _SegmentView(count, columns, values, body)
+
+
+def _decode_selected(segment: _SegmentView, selected: Iterable[bool]) -> List[Any]:
+    """Decodifica solo los registros marcados en selected."""
+    return [_decode_record(raw) for raw in compress(segment.records(), selected)]
+
+
+class StreamRecords(abc.Sequence):
+    """
+    Registros de un flujo con segmentos volcados. Los segmentos se leen
+    al recorrer la vista, de uno en uno, en lugar de cargarlos todos;
+    refleja el flujo en el momento de crearla.
+    """
+
+    def __init__(self, stream: "DataStream", live: Iterable[Any]):
+        self._stream = stream
+        self._segments = list(stream.segments)
+        self._counts = list(stream.segment_counts)
+        self._live = list(live)
+
+    def __len__(self) -> int:
+        return sum(self._counts) + len(self._live)
+
+    def __iter__(self) -> Iterator[Any]:
+        for path in self._segments:
+            with _open_segment(path, self._stream.SEGMENT_KIND) as segment:
+                records = list(map(_decode_record, segment.records()))
+            yield from records
+        yield from self._live
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StreamRecords index out of range")
+        for path, count in zip(self._segments, self._counts):
+            if index < count:
+                with _open_segment(path, self._stream.SEGMENT_KIND) as segment:
+                    raw = next(islice(segment.records(), index, None))
+                    record = _decode_record(raw)
+                    raw.release()
+                return record
+            index -= count
+        return self._live[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, StreamRecords)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"StreamRecords({len(self)} records, {len(self._segments)} segments)"
 
 
 class DataStream(ABC):
-    def __init__(self, stream_id: str):
+    def __init__(self, stream_id: str, retention: Optional[RetentionPolicy] = None):
         self.stream_id = stream_id
         self.data_buffer = []
+        self.retention = retention or KeepAll()
+        # Registros en la ventana actual, aunque no se conserven
+        self.window_count = 0
+        self._arrivals = deque()
+        # Segmentos volcados a disco, del más antiguo al más reciente
+        self.segments = []
+        self.segment_counts = []
+        self.spilled_count = 0
+        self.spill_directory = None
+        self.segment_records = 0
+        # Funciones llamadas con (flujo, lote) tras cada process_batch
+        self.listeners = []
 
     @abstractmethod
     def get_stream_type(self) -> str:
         pass
 
     @abstractmethod
-    def process_batch(self, batch: List[Any]) -> str:
+    def process_batch(self, batch: List[Any]) -> BatchResult:
         pass
 
     @abstractmethod
@@ -29,89 +579,597 @@ class DataStream(ABC):
     def get_stream_info(self) -> str:
         return f"Stream ID: {self.stream_id}, Type: {self.get_stream_type()}"
 
+    def _clear_window(self) -> None:
+        """Vacía los registros y agregados propios de la ventana."""
+
+    def _evict(self, item: Any) -> None:
+        """Retira de los agregados un registro que sale de la ventana."""
+
+    def _notify(self, batch: List[Any]) -> None:
+        """Entrega a los listeners el lote recién procesado."""
+        for listener in self.listeners:
+            listener(self, batch)
+
+    def _begin_batch(self) -> float:
+        """Abre un lote: cierra la ventana si ha vencido."""
+        now = getattr(self.retention, "clock", time.monotonic)()
+        if self.retention.starts_new_window(now):
+            self.window_count = 0
+            self._arrivals.clear()
+            self._clear_window()
+        return now
+
+    def _end_batch(self, buffer, batch: List[Any], now: float) -> None:
+        """Retiene el lote según la política y expulsa lo que sobra."""
+        retention = self.retention
+        self.window_count += len(batch)
+        if not retention.keeps_items:
+            return
+        buffer.extend(batch)
+        if retention.timed:
+            self._arrivals.extend([now] * len(batch))
+        for _ in range(retention.excess(len(buffer), self._arrivals, now)):
+            item = buffer.popleft()
+            if retention.timed:
+                self._arrivals.popleft()
+            self.window_count -= 1
+            self._evict(item)
+        if self.spill_directory is not None:
+            while len(buffer) >= self.segment_records:
+                self._spill(buffer, self.segment_records)
+
+    # Volcado a disco: los flujos con segmentos implementan SEGMENT_KIND,
+    # _retained, _encode_segment, _after_spill, _absorb_segment y
+    # _filter_segment. Las primeras columnas de un segmento reflejan los
+    # campos de SEGMENT_FIELDS; las reglas sobre ellos no decodifican
+    SEGMENT_KIND = None
+    SEGMENT_FIELDS = ()
+
+    def _segment_prefix(self) -> str:
+        return f"{self.__class__.__name__}-{self.stream_id}"
+
+    def enable_spill(self, directory: str, segment_records: int = 100_000) -> None:
+        """
+        Vuelca a disco cada segment_records registros retenidos, en
+        segmentos binarios inmutables. Los agregados siguen en memoria.
+
+        Args:
+            directory: Directorio de los segmentos
+            segment_records: Registros por segmento
+        """
+        if self.SEGMENT_KIND is None:
+            raise TypeError(f"{self.__class__.__name__} does not support spilling")
+        if not isinstance(self.retention, KeepAll):
+            raise ValueError("spilling requires KeepAll retention")
+        if segment_records < 1:
+            raise ValueError("segment_records must be at least 1")
+        if _segment_paths(directory, self._segment_prefix()) != self.segments:
+            raise FileExistsError(
+                f"{directory} already holds segments for {self.stream_id}; "
+                "replay them first"
+            )
+        os.makedirs(directory, exist_ok=True)
+        self.spill_directory = directory
+        self.segment_records = segment_records
+
+    def flush_spill(self) -> None:
+        """Vuelca los registros retenidos en memoria en un segmento final."""
+        if self.spill_directory is None:
+            raise ValueError("spilling is not enabled")
+        buffer = self._retained()
+        if buffer:
+            self._spill(buffer, len(buffer))
+
+    def _spill(self, buffer: List[Any], count: int) -> None:
+        items = buffer[:count]
+        path = os.path.join(
+            self.spill_directory,
+            f"{self._segment_prefix()}.{len(self.segments):06d}.seg",
+        )
+        # El segmento solo aparece con su nombre final una vez completo
+        with open(path + ".tmp", "wb") as handle:
+            handle.write(self._encode_segment(items))
+        os.replace(path + ".tmp", path)
+        del buffer[:count]
+        self.segments.append(path)
+        self.segment_counts.append(count)
+        self.spilled_count += count
+        self._after_spill(items)
+
+    def replay_segments(self, paths: Iterable[str]) -> int:
+        """
+        Carga segmentos en un flujo vacío. Los agregados se calculan por
+        columnas sobre la proyección en memoria, sin reconstruir registros;
+        los segmentos quedan enlazados para filter_data y select.
+
+        Returns:
+            Número de registros cargados
+        """
+        if self.SEGMENT_KIND is None:
+            raise TypeError(f"{self.__class__.__name__} does not support spilling")
+        if not isinstance(self.retention, KeepAll):
+            raise ValueError("replay requires KeepAll retention")
+        if self.window_count or self.segments:
+            raise ValueError("segments can only be replayed into an empty stream")
+        loaded = 0
+        for path in paths:
+            with _open_segment(path, self.SEGMENT_KIND) as segment:
+                self._absorb_segment(segment)
+                count = segment.count
+            self.segments.append(path)
+            self.segment_counts.append(count)
+            loaded += count
+        self.window_count += loaded
+        self.spilled_count += loaded
+        return loaded
+
+    def _spilled_matches(self) -> List[Any]:
+        """Registros volcados prioritarios, del más antiguo."""
+        records = []
+        for path in self.segments:
+            with _open_segment(path, self.SEGMENT_KIND) as segment:
+                records.extend(self._filter_segment(segment))
+        return records
+
+    def _all_records(self, live: Iterable[Any]) -> Sequence[Any]:
+        """filter_data('all'): la vista perezosa si hay segmentos volcados."""
+        if self.segments:
+            return StreamRecords(self, live)
+        return live
+
+    def select(self, predicate: Callable[[Any], bool]) -> List[Any]:
+        """
+        Registros retenidos o volcados que cumplen predicate. Si la regla
+        solo usa campos de SEGMENT_FIELDS se evalúa sobre las columnas y
+        solo se decodifican los registros que coinciden.
+        """
+        if not self.segments:
+            return list(filter(predicate, self.filter_data("all")))
+        matches = []
+        for path in self.segments:
+            with _open_segment(path, self.SEGMENT_KIND) as segment:
+                matches.extend(self._select_segment(segment, predicate))
+        matches.extend(filter(predicate, self._retained()))
+        return matches
+
+    def _select_segment(
+        self, segment: _SegmentView, predicate: Callable[[Any], bool]
+    ) -> List[Any]:
+        fields = getattr(predicate, "fields", None)
+        if not fields or not fields <= set(self.SEGMENT_FIELDS):
+            records = map(_decode_record, segment.records())
+            return list(filter(predicate, records))
+        names = sorted(fields)
+        matches = []
+        with ExitStack() as stack:
+            columns = [
+                stack.enter_context(segment.column(self.SEGMENT_FIELDS.index(name)))
+                for name in names
+            ]
+            for raw, *row in zip(segment.records(), *columns):
+                # NaN: campo ausente o no numérico, decide el registro completo
+                if any(value != value for value in row):
+                    record = _decode_record(raw)
+                    if predicate(record):
+                        matches.append(record)
+                elif predicate(dict(zip(names, row))):
+                    matches.append(_decode_record(raw))
+                raw.release()
+        return matches
+
 
 class SensorStream(DataStream):
+    HIGH_TEMP = 30
+    LOW_TEMP = 10
+    # Columnas de cada segmento; el registro completo va aparte
+    SEGMENT_KIND = _COLUMNAR_SEGMENT
+    SEGMENT_FIELDS = ("temp",)
+
+    def __init__(self, stream_id: str, retention: Optional[RetentionPolicy] = None):
+        super().__init__(stream_id, retention)
+        self._clear_window()
+
+    def _clear_window(self) -> None:
+        self.readings = self.retention.new_buffer()
+        # Buffer tipado de 8 bytes por lectura en lugar de objetos float;
+        # las lecturas expulsadas se descartan por bloques desde la cabeza
+        self.temperatures = array("d")
+        self._temperatures_head = 0
+        self.temp_stats = RunningStats(self._live_temperatures)
+        self.above_count = 0
+        self.below_count = 0
+        # Lecturas críticas de la ventana en orden de llegada
+        self.critical = self.retention.new_buffer()
+
+    def _live_temperatures(self) -> array:
+        return self.temperatures[self._temperatures_head:]
+
+    def _evict(self, reading: Any) -> None:
+        if isinstance(reading, dict) and "temp" in reading:
+            temp = reading["temp"]
+            self.temp_stats.remove(float(temp))
+            self._temperatures_head += 1
+            if self._temperatures_head * 2 >= len(self.temperatures):
+                del self.temperatures[:self._temperatures_head]
+                self._temperatures_head = 0
+            if temp > self.HIGH_TEMP:
+                self.above_count -= 1
+                self.critical.popleft()
+            elif temp < self.LOW_TEMP:
+                self.below_count -= 1
+                self.critical.popleft()
+
+    def _is_critical(self, temps: Iterable[float]) -> Iterator[bool]:
+        # NaN (sin temperatura) no cumple ninguna de las dos comparaciones
+        return map(
+            operator.or_,
+            map(float(self.HIGH_TEMP).__lt__, temps),
+            map(float(self.LOW_TEMP).__gt__, temps),
+        )
+
+    def _retained(self) -> List[Dict[str, Any]]:
+        return self.readings
+
+    def _encode_segment(self, readings: List[Any]) -> bytes:
+        return _encode_segment(
+            self.SEGMENT_KIND, readings, [_numeric_column(readings, "temp")]
+        )
 
-    def __init__(self, stream_id: str):
-        super().__init__(stream_id)
-        self.readings = []
-        self.temperatures = []
+    def _after_spill(self, readings: List[Any]) -> None:
+        temps = array("d")
+        for reading in readings:
+            if isinstance(reading, dict) and "temp" in reading:
+                temps.append(reading["temp"])
+        del self.temperatures[:len(temps)]
+        del self.critical[:sum(self._is_critical(temps))]
+
+    def _absorb_segment(self, segment: _SegmentView) -> None:
+        with segment.column(0) as column:
+            temps = array("d", filterfalse(math.isnan, column))
+        self.temp_stats.update_many(temps)
+        self.above_count += sum(map(float(self.HIGH_TEMP).__lt__, temps))
+        self.below_count += sum(map(float(self.LOW_TEMP).__gt__, temps))
+
+    def _filter_segment(self, segment: _SegmentView) -> List[Dict[str, Any]]:
+        with segment.column(0) as column:
+            critical = list(self._is_critical(column))
+        return _decode_selected(segment, critical)
 
     def get_stream_type(self) -> str:
         return "Environmental Data"
 
-    def process_batch(self, batch: List[Dict[str, Any]]) -> str:
-        self.readings.extend(batch)
-
-        batch_str = "["
-        for i, reading in enumerate(batch):
-            if isinstance(reading, dict):
-                items = [f"{k}:{v}" for k, v in reading.items()]
-                batch_str += ", ".join(items)
-            if i < len(batch) - 1:
-                batch_str += ", "
-        batch_str += "]"
-
+    def process_batch(self, batch: List[Dict[str, Any]]) -> BatchResult:
+        # El lote se valida entero antes de tocar el estado: una lectura
+        # no numérica lo rechaza sin dejar agregados a medias
+        temps = array("d")
+        critical = []
         for reading in batch:
             if isinstance(reading, dict) and "temp" in reading:
-                self.temperatures.append(reading["temp"])
-
-        return batch_str
+                temp = _number_field(reading, "temp")
+                temps.append(temp)
+                if temp > self.HIGH_TEMP or temp < self.LOW_TEMP:
+                    critical.append(reading)
+
+        now = self._begin_batch()
+        update = self.temp_stats.update
+        for temp in temps:
+            update(temp)
+        self.above_count += sum(map(float(self.HIGH_TEMP).__lt__, temps))
+        self.below_count += sum(map(float(self.LOW_TEMP).__gt__, temps))
+        if self.retention.keeps_items:
+            self.temperatures.extend(temps)
+            self.critical.extend(critical)
+        self._end_batch(self.readings, batch, now)
+        self._notify(batch)
+        return BatchResult(batch)
 
     def analyze(self) -> str:
-        count = len(self.readings)
-        if self.temperatures:
-            avg_temp = sum(self.temperatures) / len(self.temperatures)
+        count = self.window_count
+        if self.temp_stats.count:
+            avg_temp = self.temp_stats.average()
             return f"Sensor analysis: {count} readings processed, avg temp: \
 {avg_temp}°C"
         else:
             return f"Sensor analysis: {count} readings processed"
 
+    def get_temperature_summary(self) -> Dict[str, float]:
+        """Retorna el resumen estadístico de las temperaturas."""
+        if not self.retention.keeps_items:
+            return self.temp_stats.get_summary()
+        if not self.segments:
+            return summarize_readings(self._live_temperatures())
+        return summarize_chunks(self._temperature_chunks)
+
+    def _temperature_chunks(self) -> Iterator[array]:
+        """Temperaturas de cada segmento volcado y de la ventana, de una en una."""
+        for path in self.segments:
+            with _open_segment(path, self.SEGMENT_KIND) as segment:
+                with segment.column(0) as column:
+                    temps = array("d", filterfalse(math.isnan, column))
+            yield temps
+        yield self._live_temperatures()
+
     def filter_data(self, priority: str = "high") -> List[Dict[str, Any]]:
         if priority == "high":
-            critical = []
-            for reading in self.readings:
-                if isinstance(reading, dict) and "temp" in reading:
-                    temp = reading["temp"]
-                    if temp > 30 or temp < 10:
-                        critical.append(reading)
-            return critical
-        return self.readings
+            if self.segments:
+                return self._spilled_matches() + list(self.critical)
+            return list(self.critical)
+        return self._all_records(self.readings)
+
+
+# Forma de cada fila de _TransactionColumns: las de un solo importe buy o
+# sell, int o float, se reconstruyen desde las columnas; el resto se
+# guarda tal cual
+_BUY_INT, _BUY_FLOAT, _SELL_INT, _SELL_FLOAT, _IRREGULAR = range(5)
+# Mayor entero que float64 representa sin pérdida
+_EXACT_INT = 2**53
+# Campo y tipo del importe de cada forma regular
+_KIND_SIDES = ("buy", "buy", "sell", "sell")
+_KIND_TYPES = (int, float, int, float)
+
+
+class _TransactionColumns:
+    """
+    Transacciones retenidas por columnas: forma, importe comprado y
+    vendido, mayor valor numérico y llegada. Las de un solo importe no
+    guardan el diccionario, que se reconstruye al leerlas; las demás se
+    guardan aparte por posición. Como en un deque, las filas salen por
+    la cabeza, y las columnas se recortan por bloques.
+    """
+
+    def __init__(self):
+        self.kinds = array("b")
+        self.buy_amounts = array("d")
+        self.sell_amounts = array("d")
+        self.peak_amounts = array("d")
+        self.arrivals = array("d")
+        # Filas irregulares por posición absoluta (base + posición)
+        self.irregular = {}
+        # Posición en las columnas de la primera fila retenida y posición
+        # absoluta de la columna 0
+        self.head = 0
+        self.base = 0
+
+    def _columns(self) -> List[array]:
+        return [
+            self.kinds,
+            self.buy_amounts,
+            self.sell_amounts,
+            self.peak_amounts,
+            self.arrivals,
+        ]
+
+    def row(self, position: int) -> Any:
+        """Transacción en la posición position de las columnas."""
+        kind = self.kinds[position]
+        if kind == _IRREGULAR:
+            return self.irregular[self.base + position]
+        if kind < _SELL_INT:
+            side, amount = "buy", self.buy_amounts[position]
+        else:
+            side, amount = "sell", self.sell_amounts[position]
+        if kind == _BUY_INT or kind == _SELL_INT:
+            amount = int(amount)
+        return {side: amount}
+
+    def select(self, mask: Optional[Iterable[bool]] = None) -> List[Any]:
+        """
+        Filas retenidas marcadas en mask (todas si es None), en orden. En
+        las filas regulares el importe es el mayor valor numérico, así
+        que se reconstruyen desde peak_amounts en una sola pasada.
+        """
+        head = self.head
+        mask = [True] * len(self) if mask is None else list(mask)
+        positions = compress(range(self.base + head, self.base + len(self.kinds)), mask)
+        kinds = compress(self.kinds[head:], mask)
+        amounts = compress(self.peak_amounts[head:], mask)
+        irregular = self.irregular
+        return [
+            irregular[position]
+            if kind == _IRREGULAR
+            else {_KIND_SIDES[kind]: _KIND_TYPES[kind](amount)}
+            for position, kind, amount in zip(positions, kinds, amounts)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.kinds) - self.head
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.row, range(self.head, len(self.kinds)))
+
+    def __getitem__(self, index):
+        positions = range(self.head, len(self.kinds))[index]
+        if isinstance(index, slice):
+            return list(map(self.row, positions))
+        return self.row(positions)
+
+    def __delitem__(self, index: slice) -> None:
+        """Solo se retiran filas por la cabeza: del rows[:count]."""
+        if not isinstance(index, slice):
+            raise TypeError("only head slices can be deleted")
+        start, stop, step = index.indices(len(self))
+        if start or step != 1:
+            raise ValueError("only head slices can be deleted")
+        self._drop(stop)
+
+    def extend(self, rows: "_TransactionColumns") -> None:
+        """Añade al final las filas de otro bloque de columnas."""
+        offset = self.base + len(self.kinds) - rows.base - rows.head
+        for column, other in zip(self._columns(), rows._columns()):
+            column.extend(other[rows.head:])
+        for position, transaction in rows.irregular.items():
+            self.irregular[position + offset] = transaction
+
+    def popleft(self) -> Any:
+        head = self.head
+        if head >= len(self.kinds):
+            raise IndexError("pop from empty transaction columns")
+        transaction = self.row(head)
+        if self.irregular:
+            self.irregular.pop(self.base + head, None)
+        self.head = head + 1
+        if self.head * 2 >= len(self.kinds):
+            self._compact()
+        return transaction
+
+    def _drop(self, count: int) -> None:
+        if self.irregular:
+            first = self.base + self.head
+            for position in range(first, first + count):
+                self.irregular.pop(position, None)
+        self.head += count
+        if self.head * 2 >= len(self.kinds):
+            self._compact()
+
+    def _compact(self) -> None:
+        for column in self._columns():
+            del column[:self.head]
+        self.base += self.head
+        self.head = 0
 
 
 class TransactionStream(DataStream):
-    def __init__(self, stream_id: str):
-        super().__init__(stream_id)
-        self.transactions = []
+    LARGE_AMOUNT = 100
+    # Columnas de cada segmento: buy, sell y el mayor valor numérico; los
+    # valores sueltos son todos los importes y el registro completo va aparte
+    SEGMENT_KIND = _COLUMNAR_SEGMENT
+    SEGMENT_FIELDS = ("buy", "sell")
+
+    def __init__(
+        self,
+        stream_id: str,
+        retention: Optional[RetentionPolicy] = None,
+        large_threshold: float = LARGE_AMOUNT,
+    ):
+        super().__init__(stream_id, retention)
+        self.large_threshold = large_threshold
+        self._clear_window()
+
+    def _clear_window(self) -> None:
+        # Ventana por columnas: sin un diccionario por operación retenida
+        self.transactions = _TransactionColumns()
         self.buy_total = 0
         self.sell_total = 0
+        self.amount_stats = RunningStats(self._live_amounts)
 
-    def get_stream_type(self) -> str:
-        return "Financial Data"
+    def _live_amounts(self) -> Iterator[float]:
+        for transaction in self.transactions:
+            if isinstance(transaction, dict):
+                for value in transaction.values():
+                    if isinstance(value, (int, float)):
+                        yield value
+
+    def _evict(self, transaction: Any) -> None:
+        if isinstance(transaction, dict):
+            if "buy" in transaction:
+                self.buy_total -= transaction["buy"]
+            if "sell" in transaction:
+                self.sell_total -= transaction["sell"]
+            for value in transaction.values():
+                if isinstance(value, (int, float)):
+                    self.amount_stats.remove(value)
+
+    def _retained(self) -> _TransactionColumns:
+        return self.transactions
 
-    def process_batch(self, batch: List[Dict[str, Any]]) -> str:
-        self.transactions.extend(batch)
+    def _encode_segment(self, transactions: List[Any]) -> bytes:
+        rows = self.transactions
+        peaks = rows.peak_amounts[rows.head:rows.head + len(transactions)]
+        amounts = array(
+            "d",
+            [
+                value
+                for transaction in transactions
+                if isinstance(transaction, dict)
+                for value in transaction.values()
+                if isinstance(value, (int, float))
+            ],
+        )
+        columns = [
+            _numeric_column(transactions, "buy"),
+            _numeric_column(transactions, "sell"),
+            peaks,
+        ]
+        return _encode_segment(self.SEGMENT_KIND, transactions, columns, amounts)
+
+    def _after_spill(self, transactions: List[Any]) -> None:
+        # del buffer[:count] ya ha recortado las columnas
+        pass
 
-        batch_str = "["
-        for i, transaction in enumerate(batch):
-            if isinstance(transaction, dict):
-                items = [f"{k}:{v}" for k, v in transaction.items()]
-                batch_str += ", ".join(items)
-            if i < len(batch) - 1:
-                batch_str += ", "
-        batch_str += "]"
+    def _absorb_segment(self, segment: _SegmentView) -> None:
+        with segment.column(0) as column:
+            self.buy_total += _integral(math.fsum(filterfalse(math.isnan, column)))
+        with segment.column(1) as column:
+            self.sell_total += _integral(math.fsum(filterfalse(math.isnan, column)))
+        with segment.loose_values() as amounts:
+            self.amount_stats.update_many(amounts)
 
+    def _filter_segment(self, segment: _SegmentView) -> List[Dict[str, Any]]:
+        # Igual que en memoria: grande si algún valor numérico supera el umbral
+        with segment.column(2) as peaks:
+            large = list(map(float(self.large_threshold).__lt__, peaks))
+        return _decode_selected(segment, large)
+
+    def get_stream_type(self) -> str:
+        return "Financial Data"
+
+    def process_batch(self, batch: List[Dict[str, Any]]) -> BatchResult:
+        # El lote se valida entero antes de tocar el estado: un importe
+        # no numérico lo rechaza sin dejar totales a medias
+        buy_values = []
+        sell_values = []
+        amounts = []
+        rows = _TransactionColumns()
+        kinds = rows.kinds
+        buys = rows.buy_amounts
+        sells = rows.sell_amounts
+        peaks = rows.peak_amounts
         for transaction in batch:
+            buy = sell = 0
+            peak = -math.inf
+            kind = _IRREGULAR
             if isinstance(transaction, dict):
                 if "buy" in transaction:
-                    self.buy_total += transaction["buy"]
+                    buy = _number_field(transaction, "buy")
+                    buy_values.append(buy)
+                    kind = _BUY_INT
                 if "sell" in transaction:
-                    self.sell_total += transaction["sell"]
-
-        return batch_str
+                    sell = _number_field(transaction, "sell")
+                    sell_values.append(sell)
+                    kind = _SELL_INT
+                for value in transaction.values():
+                    if isinstance(value, (int, float)):
+                        amounts.append(value)
+                        if value > peak:
+                            peak = value
+                # Un solo campo buy o sell: su importe es peak
+                if len(transaction) != 1 or kind == _IRREGULAR:
+                    kind = _IRREGULAR
+                elif type(peak) is float:
+                    kind += 1
+                elif type(peak) is not int or abs(peak) > _EXACT_INT:
+                    kind = _IRREGULAR
+            if kind == _IRREGULAR:
+                rows.irregular[len(kinds)] = transaction
+            kinds.append(kind)
+            buys.append(buy)
+            sells.append(sell)
+            peaks.append(peak)
+
+        now = self._begin_batch()
+        self.buy_total = sum(buy_values, self.buy_total)
+        self.sell_total = sum(sell_values, self.sell_total)
+        update = self.amount_stats.update
+        for value in amounts:
+            update(value)
+        # Llegadas con el reloj monótono de la retención
+        rows.arrivals.extend(array("d", [now]) * len(batch))
+        self._end_batch(self.transactions, rows, now)
+        self._notify(batch)
+        return BatchResult(batch)
 
     def analyze(self) -> str:
-        count = len(self.transactions)
+        count = self.window_count
         net_flow = self.sell_total - self.buy_total
         sign = "+" if net_flow >= 0 else ""
         return f"Transaction analysis: {count} operations, net flow: \
@@ -119,47 +1177,460 @@ class TransactionStream(DataStream):
 
     def filter_data(self, priority: str = "high") -> List[Dict[str, Any]]:
         if priority == "high":
-            large_transactions = []
-            for transaction in self.transactions:
-                if isinstance(transaction, dict):
-                    for key, value in transaction.items():
-                        if isinstance(value, (int, float)) and value > 100:
-                            large_transactions.append(transaction)
-                            break
-            return large_transactions
-        return self.transactions
+            if self.segments:
+                return self._spilled_matches() + self.find_large()
+            return self.find_large()
+        return self._all_records(self.transactions.select())
+
+    def find_large(self, threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Operaciones retenidas con algún importe mayor que threshold (por
+        defecto el del flujo). Se recorre la columna de importes máximos
+        con funciones nativas y solo se reconstruyen las coincidencias.
+        """
+        if threshold is None:
+            threshold = self.large_threshold
+        rows = self.transactions
+        peaks = rows.peak_amounts[rows.head:]
+        return rows.select(map(float(threshold).__lt__, peaks))
+
+    def window_aggregates(self, seconds: float) -> List[Dict[str, float]]:
+        """
+        Agregados por ventanas de llegada de duración fija: número de
+        operaciones, volumen comprado y vendido, flujo neto y tamaño medio
+        ponderado por volumen (análogo al VWAP sin precio).
+        Las columnas se recorren por tramos contiguos sin bucles por fila.
+        Las llegadas usan el reloj de la retención (time.monotonic por
+        defecto), así que window_start no es una fecha.
+
+        Args:
+            seconds: Duración de cada ventana
+
+        Returns:
+            Un diccionario por ventana con datos, en orden temporal
+        """
+        if seconds <= 0:
+            raise ValueError("seconds must be positive")
+        rows = self.transactions
+        arrivals = rows.arrivals
+        end = len(arrivals)
+        windows = []
+        start = rows.head
+        while start < end:
+            window_start = arrivals[start] - arrivals[start] % seconds
+            stop = bisect_left(arrivals, window_start + seconds, start, end)
+            buys = rows.buy_amounts[start:stop]
+            sells = rows.sell_amounts[start:stop]
+            buy_volume = math.fsum(buys)
+            sell_volume = math.fsum(sells)
+            volume = buy_volume + sell_volume
+            squares = math.fsum(map(operator.mul, buys, buys)) + math.fsum(
+                map(operator.mul, sells, sells)
+            )
+            windows.append(
+                {
+                    "window_start": window_start,
+                    "count": stop - start,
+                    "buy_volume": buy_volume,
+                    "sell_volume": sell_volume,
+                    "net_flow": sell_volume - buy_volume,
+                    "volume_weighted_size": squares / volume if volume else 0.0,
+                }
+            )
+            start = stop
+        return windows
 
 
 class EventStream(DataStream):
+    TOKEN_PATTERN = re.compile(r"\w+")
+    SEGMENT_KIND = _EVENT_SEGMENT
+
+    def __init__(self, stream_id: str, retention: Optional[RetentionPolicy] = None):
+        super().__init__(stream_id, retention)
+        # Número de secuencia global del siguiente evento
+        self._next_seq = 0
+        self._clear_window()
 
-    def __init__(self, stream_id: str):
-        super().__init__(stream_id)
-        self.events = []
+    def _clear_window(self) -> None:
+        self.events = self.retention.new_buffer()
         self.error_count = 0
+        # Índice invertido: token en minúsculas -> secuencias ordenadas
+        self._index = {}
+        self._error_seqs = array("q")
+        # Hora de llegada de cada evento, empezando por la secuencia _times_base
+        self._times = array("d")
+        self._times_base = self._next_seq
+        self._evicted = 0
+
+    def _first_seq(self) -> int:
+        return self._next_seq - len(self.events)
+
+    def _evict(self, event: Any) -> None:
+        if isinstance(event, str) and "error" in event.lower():
+            self.error_count -= 1
+        # Las secuencias expulsadas se ignoran en las consultas y se
+        # purgan del índice por bloques
+        self._evicted += 1
+        if self._evicted >= max(1024, len(self.events)):
+            self._compact_index()
+
+    def _compact_index(self) -> None:
+        first = self._first_seq()
+        for token, postings in list(self._index.items()):
+            cut = bisect_left(postings, first)
+            if cut == len(postings):
+                del self._index[token]
+            elif cut:
+                del postings[:cut]
+        del self._error_seqs[:bisect_left(self._error_seqs, first)]
+        del self._times[:first - self._times_base]
+        self._times_base = first
+        self._evicted = 0
+
+    def _retained(self) -> List[str]:
+        return self.events
+
+    def _events_at(self, seqs: Iterable[int]) -> List[Any]:
+        """
+        Eventos retenidos con las secuencias dadas, en orden creciente.
+        En un deque el acceso por índice recorre bloques desde un extremo,
+        así que se marca cada posición y se recorre el buffer una vez.
+        """
+        events = self.events
+        first = self._first_seq()
+        if isinstance(events, list):
+            return [events[seq - first] for seq in seqs]
+        if isinstance(seqs, range):
+            return list(islice(events, seqs.start - first, seqs.stop - first))
+        selected = bytearray(len(events))
+        for seq in seqs:
+            selected[seq - first] = 1
+        return list(compress(events, selected))
+
+    def _encode_segment(self, events: List[Any]) -> bytes:
+        # Posiciones de los errores del segmento, tomadas de _error_seqs
+        first = self._first_seq()
+        errors = self._error_seqs
+        start = bisect_left(errors, first)
+        stop = bisect_left(errors, first + len(events), start)
+        positions = array("d", [seq - first for seq in errors[start:stop]])
+        return _encode_segment(self.SEGMENT_KIND, events, values=positions)
+
+    def _after_spill(self, events: List[Any]) -> None:
+        # Como en la expulsión, query ya no ve las secuencias volcadas
+        self._evicted += len(events)
+        if self._evicted >= max(1024, len(self.events)):
+            self._compact_index()
+
+    def _absorb_segment(self, segment: _SegmentView) -> None:
+        self.error_count += segment.values
+        self._next_seq += segment.count
+        self._times_base = self._next_seq
+
+    def _filter_segment(self, segment: _SegmentView) -> List[str]:
+        errors = bytearray(segment.count)
+        with segment.loose_values() as positions:
+            for position in positions:
+                errors[int(position)] = 1
+        return _decode_selected(segment, errors)
 
     def get_stream_type(self) -> str:
         return "System Events"
 
-    def process_batch(self, batch: List[str]) -> str:
-        self.events.extend(batch)
+    def process_batch(self, batch: List[str]) -> BatchResult:
+        now = self._begin_batch()
+        arrival = time.time()
+        keeps_items = self.retention.keeps_items
+        index = self._index
+        tokenize = self.TOKEN_PATTERN.findall
+        seq = self._next_seq
 
         for event in batch:
-            if isinstance(event, str) and "error" in event.lower():
-                self.error_count += 1
-
-        batch_str = "[" + ", ".join(batch) + "]"
-        return batch_str
+            if isinstance(event, str):
+                lowered = event.lower()
+                if "error" in lowered:
+                    self.error_count += 1
+                    if keeps_items:
+                        self._error_seqs.append(seq)
+                if keeps_items:
+                    for token in set(tokenize(lowered)):
+                        postings = index.get(token)
+                        if postings is None:
+                            postings = index[token] = array("q")
+                        postings.append(seq)
+            seq += 1
+
+        self._next_seq = seq
+        if keeps_items:
+            self._times.extend([arrival] * len(batch))
+        self._end_batch(self.events, batch, now)
+        self._notify(batch)
+        return BatchResult(batch)
 
     def analyze(self) -> str:
-        count = len(self.events)
+        count = self.window_count
         plural = "s" if self.error_count != 1 else ""
         return f"Event analysis: {count} events, {self.error_count} \
 error{plural} detected"
 
     def filter_data(self, priority: str = "high") -> List[str]:
         if priority == "high":
-            return [event for event in self.events if "error" in event.lower()]
-        return self.events
+            errors = self._error_seqs
+            retained = self._events_at(errors[bisect_left(errors, self._first_seq()):])
+            if self.segments:
+                return self._spilled_matches() + retained
+            return retained
+        return self._all_records(self.events)
+
+    def query(
+        self,
+        keyword: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Busca eventos retenidos en memoria por palabra clave o severidad y/o por
+        rango de llegada [start, end] en segundos de época.
+
+        Args:
+            keyword: Token a buscar, sin distinguir mayúsculas
+            start: Hora de llegada mínima
+            end: Hora de llegada máxima
+
+        Returns:
+            Eventos en orden de llegada
+        """
+        first = self._first_seq()
+        offset = first - self._times_base
+        low = first
+        high = self._next_seq
+        if start is not None:
+            low = self._times_base + bisect_left(self._times, start, offset)
+        if end is not None:
+            high = self._times_base + bisect_right(self._times, end, offset)
+
+        if keyword is None:
+            seqs = range(low, high)
+        else:
+            postings = self._index.get(keyword.lower())
+            if postings is None:
+                return []
+            seqs = postings[bisect_left(postings, low):bisect_left(postings, high)]
+
+        return self._events_at(seqs)
+
+    def get_index_memory(self) -> Dict[str, int]:
+        """Retorna el tamaño del índice: tokens, entradas y bytes."""
+        size = sys.getsizeof(self._index)
+        postings = 0
+        for token, seqs in self._index.items():
+            size += sys.getsizeof(token) + sys.getsizeof(seqs)
+            postings += len(seqs)
+        size += sys.getsizeof(self._error_seqs) + sys.getsizeof(self._times)
+        return {"tokens": len(self._index), "postings": postings, "bytes": size}
+
+
+class RuleSyntaxError(ValueError):
+    """Regla de prioridad mal formada."""
+
+
+_RULE_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<op>>=|<=|==|!=|>|<|\(|\))
+      | (?P<name>[A-Za-z_]\w*)
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARISONS = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_KEYWORDS = {"and", "or", "not", "contains"}
+
+
+def _tokenize_rule(text: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _RULE_TOKEN.match(text, position)
+        if not match:
+            raise RuleSyntaxError(f"Unexpected input at {position}: {text[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            value = float(value) if "." in value else int(value)
+        elif kind == "string":
+            value = value[1:-1]
+        elif kind == "name" and value.lower() in _KEYWORDS:
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value))
+    return tokens
+
+
+class _RuleParser:
+    """
+    Analizador descendente de reglas de prioridad, por ejemplo
+    'temp > 30 or temp < 10' o 'text contains "error"'. Genera closures;
+    nunca evalúa código Python. El predicado lleva en .fields los campos
+    que consulta.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize_rule(text)
+        self.position = 0
+        self.fields = set()
+
+    def parse(self) -> Callable[[Any], bool]:
+        if not self.tokens:
+            raise RuleSyntaxError("Empty rule")
+        predicate = self._or()
+        if self.position != len(self.tokens):
+            raise RuleSyntaxError(f"Unexpected token {self.tokens[self.position][1]!r}")
+        # Cada análisis crea closures nuevas: el atributo no se comparte
+        predicate.fields = frozenset(self.fields)
+        return predicate
+
+    def _peek(self) -> Tuple[str, Any]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", None)
+
+    def _take(self) -> Tuple[str, Any]:
+        token = self._peek()
+        if token[0] == "end":
+            raise RuleSyntaxError(f"Incomplete rule: {self.text!r}")
+        self.position += 1
+        return token
+
+    def _or(self) -> Callable[[Any], bool]:
+        terms = [self._and()]
+        while self._peek() == ("keyword", "or"):
+            self._take()
+            terms.append(self._and())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda record: any(term(record) for term in terms)
+
+    def _and(self) -> Callable[[Any], bool]:
+        terms = [self._not()]
+        while self._peek() == ("keyword", "and"):
+            self._take()
+            terms.append(self._not())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda record: all(term(record) for term in terms)
+
+    def _not(self) -> Callable[[Any], bool]:
+        if self._peek() == ("keyword", "not"):
+            self._take()
+            term = self._not()
+            return lambda record: not term(record)
+        return self._atom()
+
+    def _atom(self) -> Callable[[Any], bool]:
+        if self._peek() == ("op", "("):
+            self._take()
+            predicate = self._or()
+            if self._take() != ("op", ")"):
+                raise RuleSyntaxError(f"Missing ')' in {self.text!r}")
+            return predicate
+
+        left = self._operand()
+        kind, value = self._take()
+        if (kind, value) == ("keyword", "contains"):
+            needle = str(self._literal()).lower()
+
+            def contains(record: Any) -> bool:
+                found = left(record)
+                return isinstance(found, str) and needle in found.lower()
+
+            return contains
+        if kind != "op" or value not in _COMPARISONS:
+            raise RuleSyntaxError(f"Expected comparison, got {value!r}")
+        compare = _COMPARISONS[value]
+        right = self._literal()
+
+        def comparison(record: Any) -> bool:
+            found = left(record)
+            if found is None:
+                return False
+            try:
+                return compare(found, right)
+            except TypeError:
+                return False
+
+        return comparison
+
+    def _operand(self) -> Callable[[Any], Any]:
+        kind, name = self._take()
+        if kind != "name":
+            raise RuleSyntaxError(f"Expected field name, got {name!r}")
+        self.fields.add(name)
+        if name == "text":
+            # 'text' es el propio registro cuando es una cadena (eventos)
+            return lambda record: record if isinstance(record, str) else None
+        return lambda record: record.get(name) if isinstance(record, dict) else None
+
+    def _literal(self) -> Any:
+        kind, value = self._take()
+        if kind not in ("number", "string"):
+            raise RuleSyntaxError(f"Expected literal, got {value!r}")
+        return value
+
+
+# Reglas distintas que conserva la caché de compile_rule
+RULE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=RULE_CACHE_SIZE)
+def compile_rule(text: str) -> Callable[[Any], bool]:
+    """
+    Compila una regla de prioridad a un predicado sobre un registro.
+    Las reglas recientes se compilan una sola vez y comparten predicado;
+    la caché está acotada para las reglas que llegan del usuario.
+    """
+    return _RuleParser(text).parse()
+
+
+class Subscription:
+    """Suscripción a los registros nuevos que cumplen una regla."""
+
+    def __init__(
+        self,
+        name: str,
+        rule: str,
+        stream_type: Optional[str] = None,
+        callback: Optional[Callable[[str, Any], None]] = None,
+    ):
+        """
+        Args:
+            name: Nombre de la suscripción
+            rule: Regla de prioridad
+            stream_type: Clase de flujo a la que se limita (None = todas)
+            callback: Función llamada con (stream_id, registro) por coincidencia
+        """
+        self.name = name
+        self.rule = rule
+        self.predicate = compile_rule(rule)
+        self.stream_type = stream_type
+        self.callback = callback
+        self.matches = []
+
+    def drain(self) -> List[Any]:
+        """Retorna y vacía las coincidencias acumuladas."""
+        matches, self.matches = self.matches, []
+        return matches
 
 
 class StreamProcessor:
@@ -172,6 +1643,11 @@ class StreamProcessor:
     def __init__(self):
         """Inicializa el procesador de flujos."""
         self.streams = []
+        # Fallos aislados por flujo de los modos concurrentes
+        self.failures = []
+        self.subscriptions = []
+        # Por tipo de flujo: (predicado, suscripciones) sin reglas repetidas
+        self._subscription_groups = {}
 
     def add_stream(self, stream: DataStream) -> None:
         """
@@ -181,6 +1657,9 @@ class StreamProcessor:
             stream: Cualquier subtipo de DataStream
         """
         self.streams.append(stream)
+        # Las suscripciones ven también los lotes pasados directamente
+        # a stream.process_batch()
+        stream.listeners.append(self._dispatch)
 
     def process_all(self, batches: List[List[Any]]) -> List[str]:
         """
@@ -208,13 +1687,167 @@ class StreamProcessor:
 
         return results
 
-    def filter_all_streams(self, priority: str = "high") -> Dict[str, List[Any]]:
+    def _record_failure(self, stream: DataStream, error: Exception) -> str:
+        """Registra el fallo de un flujo y retorna su mensaje."""
+        self.failures.append(
+            {
+                "stream_id": stream.stream_id,
+                "stream_type": stream.__class__.__name__,
+                "error_type": type(error).__name__,
+                "error": str(error),
+                "time": time.time(),
+            }
+        )
+        return f"Error processing stream {stream.stream_id}: {error}"
+
+    def subscribe(
+        self,
+        name: str,
+        rule: str,
+        stream_type: Optional[str] = None,
+        callback: Optional[Callable[[str, Any], None]] = None,
+    ) -> Subscription:
+        """
+        Registra una regla que se evalúa sobre cada lote nuevo de los
+        flujos añadidos, los procese el procesador o stream.process_batch().
+        Todas las suscripciones comparten un único recorrido por lote.
+
+        Args:
+            name: Nombre de la suscripción
+            rule: Regla de prioridad, p. ej. 'temp > 30 or temp < 10'
+            stream_type: Nombre de clase del flujo (None = todos)
+            callback: Función llamada con (stream_id, registro)
 
+        Returns:
+            La suscripción, que acumula sus coincidencias
+        """
+        subscription = Subscription(name, rule, stream_type, callback)
+        self.subscriptions.append(subscription)
+        self._subscription_groups.clear()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.remove(subscription)
+        self._subscription_groups.clear()
+
+    def _groups_for(self, stream_type: str) -> List[Tuple[Callable, List[Subscription]]]:
+        groups = self._subscription_groups.get(stream_type)
+        if groups is None:
+            by_predicate = {}
+            for subscription in self.subscriptions:
+                if subscription.stream_type in (None, stream_type):
+                    by_predicate.setdefault(subscription.predicate, []).append(
+                        subscription
+                    )
+            groups = list(by_predicate.items())
+            self._subscription_groups[stream_type] = groups
+        return groups
+
+    def _dispatch(self, stream: DataStream, batch: List[Any]) -> None:
+        """Evalúa cada regla distinta una vez por registro del lote."""
+        groups = self._groups_for(stream.__class__.__name__)
+        if not groups:
+            return
+        stream_id = stream.stream_id
+        for record in batch:
+            for predicate, subscriptions in groups:
+                if predicate(record):
+                    for subscription in subscriptions:
+                        subscription.matches.append(record)
+                        if subscription.callback is not None:
+                            subscription.callback(stream_id, record)
+
+    def _process_one(self, stream: DataStream, batch: List[Any]) -> str:
+        try:
+            stream.process_batch(batch)
+            return stream.analyze()
+        except Exception as e:
+            return self._record_failure(stream, e)
+
+    def process_all_concurrent(
+        self, batches: List[List[Any]], max_workers: int = 4
+    ) -> List[str]:
+        """
+        Procesa el lote de cada flujo en un pool de hilos.
+        Un fallo solo afecta a su flujo: queda en self.failures y su
+        resultado es el mensaje de error.
+
+        Args:
+            batches: Lista de lotes, uno por flujo
+            max_workers: Máximo de flujos procesándose a la vez
+
+        Returns:
+            Resultados en el orden de los flujos
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        pairs = list(zip(self.streams, batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(lambda pair: self._process_one(*pair), pairs)
+            )
+
+    def process_streaming(
+        self, sources: List[Iterable[List[Any]]], max_workers: int = 4
+    ) -> List[str]:
+        """
+        Cada flujo consume los lotes de su propio iterador en un hilo,
+        de modo que una fuente lenta no frena la ingesta de las demás.
+        Un fallo detiene solo su flujo y queda en self.failures.
+
+        Args:
+            sources: Iteradores de lotes, uno por flujo
+            max_workers: Máximo de flujos consumiéndose a la vez
+
+        Returns:
+            Análisis final de cada flujo en el orden de los flujos
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        def consume(stream: DataStream, source: Iterable[List[Any]]) -> str:
+            try:
+                for batch in source:
+                    stream.process_batch(batch)
+                return stream.analyze()
+            except Exception as e:
+                return self._record_failure(stream, e)
+
+        pairs = list(zip(self.streams, sources))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda pair: consume(*pair), pairs))
+
+    def replay(self, directory: str) -> int:
+        """
+        Reconstruye los flujos del procesador a partir de los segmentos
+        que otros flujos con la misma clase e identificador volcaron en
+        directory. Los flujos deben estar vacíos.
+
+        Returns:
+            Número total de registros cargados
+        """
+        loaded = 0
+        for stream in self.streams:
+            if stream.SEGMENT_KIND is not None:
+                paths = _segment_paths(directory, stream._segment_prefix())
+                loaded += stream.replay_segments(paths)
+        return loaded
+
+    def filter_all_streams(self, priority: str = "high") -> Dict[str, List[Any]]:
+        """
+        Filtra los datos retenidos de cada flujo. priority puede ser un
+        nivel ('high') o una regla como 'temp > 30 or temp < 10'.
+        """
         filtered_results = {}
 
         try:
+            # Un nivel es una sola palabra; cualquier otra cosa es una regla
+            predicate = None if priority.isidentifier() else compile_rule(priority)
             for stream in self.streams:
-                filtered_data = stream.filter_data(priority)
+                if predicate is None:
+                    filtered_data = stream.filter_data(priority)
+                else:
+                    filtered_data = stream.select(predicate)
                 stream_type = stream.__class__.__name__
                 filtered_results[stream_type] = filtered_data
         except Exception as e:
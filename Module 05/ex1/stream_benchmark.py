@@ -0,0 +1,292 @@
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from data_stream import (
+    CountWindow,
+    EventStream,
+    SensorStream,
+    SlidingWindow,
+    StreamProcessor,
+    SummariesOnly,
+    TumblingWindow,
+    TransactionStream,
+    summarize_readings,
+)
+
+
+def report(label: str, elapsed: float, memory: int) -> None:
+    print(f"{label:<32} {elapsed:8.3f}s  {memory / 2**20:10.1f} MiB")
+
+
+def ingest(values: list, typed: bool):
+    buffer = array("d") if typed else []
+    for value in values:
+        buffer.append(value / 100)
+    return buffer
+
+
+def measure_buffer(values: list, typed: bool) -> None:
+    start = time.perf_counter()
+    buffer = ingest(values, typed)
+    elapsed = time.perf_counter() - start
+
+    # Memoria medida en una segunda ingesta para no distorsionar el tiempo
+    tracemalloc.start()
+    traced = ingest(values, typed)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+    report("ingest array('d')" if typed else "ingest list[float]", elapsed, memory)
+
+    start = time.perf_counter()
+    summarize_readings(buffer)
+    label = "summary array('d')" if typed else "summary list[float]"
+    report(label, time.perf_counter() - start, 0)
+
+
+# Políticas de retención de las pruebas de resistencia
+SOAK_POLICIES = {
+    "count window 100k": lambda: CountWindow(100_000),
+    "tumbling 1s": lambda: TumblingWindow(1.0),
+    "sliding 1s": lambda: SlidingWindow(1.0),
+    "summaries only": SummariesOnly,
+}
+
+
+def current_rss_mib() -> float:
+    """RSS actual del proceso (Linux); ru_maxrss solo da el máximo histórico."""
+    with open("/proc/self/statm") as statm:
+        resident_pages = int(statm.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def soak(label: str, count: int, batch_size: int = 1000) -> None:
+    """Ingesta sostenida; se ejecuta en un proceso nuevo (run_soak)."""
+    stream = SensorStream("SOAK", SOAK_POLICIES[label]())
+    print(f"Soak: {label}  (start RSS {current_rss_mib():.1f} MiB)")
+    checkpoints = 5
+    step = max(batch_size, count // checkpoints)
+    start = time.perf_counter()
+    processed = 0
+    next_report = step
+    while processed < count:
+        batch = [{"temp": (processed + i) % 45} for i in range(batch_size)]
+        stream.process_batch(batch)
+        processed += batch_size
+        if processed >= next_report:
+            print(
+                f"    {processed:>12,} records  RSS {current_rss_mib():8.1f} MiB  "
+                f"window {stream.window_count:>9,}"
+            )
+            next_report += step
+    report(f"soak {label}", time.perf_counter() - start, 0)
+
+
+def run_soak(label: str, count: int) -> None:
+    """
+    Ejecuta una prueba de resistencia aislada en un proceso nuevo, para
+    que la memoria de las pruebas anteriores no enmascare la suya.
+    """
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=soak, args=(label, count))
+    process.start()
+    process.join()
+    if process.exitcode:
+        print(f"    soak {label} failed with exit code {process.exitcode}")
+
+
+def bench_ingest(batches: int = 50, batch_size: int = 10_000) -> None:
+    sensor = [{"temp": i % 45, "humidity": 60, "pressure": 1013} for i in range(batch_size)]
+    trades = [{"buy" if i % 2 else "sell": i % 250} for i in range(batch_size)]
+    events = ["login" if i % 7 else "error: disk" for i in range(batch_size)]
+    for render in (True, False):
+        streams = [
+            (SensorStream("BENCH"), sensor),
+            (TransactionStream("BENCH"), trades),
+            (EventStream("BENCH"), events),
+        ]
+        for stream, batch in streams:
+            start = time.perf_counter()
+            for _ in range(batches):
+                result = stream.process_batch(batch)
+                if render:
+                    str(result)
+            elapsed = time.perf_counter() - start
+            rate = batches * batch_size / elapsed
+            mode = "rendered" if render else "lazy"
+            print(f"ingest {stream.__class__.__name__:<18} {mode:<8} {rate:14,.0f} rec/s")
+
+
+def bench_event_index(count: int, batch_size: int = 10_000) -> None:
+    messages = [
+        "user login",
+        "user logout",
+        "ERROR: disk full",
+        "WARNING: high latency",
+        "INFO: cache warmed",
+        "CRITICAL: node down",
+    ]
+    stream = EventStream("BENCH")
+    batch = [messages[i % len(messages)] + f" id{i % 997}" for i in range(batch_size)]
+    start = time.perf_counter()
+    for _ in range(max(1, count // batch_size)):
+        stream.process_batch(batch)
+    report(f"index {len(stream.events):,} events", time.perf_counter() - start, 0)
+
+    middle = stream._times[len(stream._times) // 2]
+    queries = [
+        ("keyword 'critical'", lambda: stream.query("critical")),
+        ("keyword 'id42'", lambda: stream.query("id42")),
+        ("filter_data('high')", lambda: stream.filter_data("high")),
+        ("time range + 'warning'", lambda: stream.query("warning", start=middle)),
+    ]
+    for label, run in queries:
+        start = time.perf_counter()
+        found = len(run())
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"    {label:<26} {found:>10,} hits  {elapsed:9.2f} ms")
+    memory = stream.get_index_memory()
+    print(
+        f"    index memory: {memory['tokens']:,} tokens, "
+        f"{memory['postings']:,} postings, {memory['bytes'] / 2**20:.1f} MiB"
+    )
+
+
+def scan_large(transactions: list, threshold: float) -> list:
+    """Recorrido por filas del filtro anterior, como referencia."""
+    large = []
+    for transaction in transactions:
+        if isinstance(transaction, dict):
+            for value in transaction.values():
+                if isinstance(value, (int, float)) and value > threshold:
+                    large.append(transaction)
+                    break
+    return large
+
+
+def make_trades(rng: random.Random, count: int) -> list:
+    return [{rng.choice(("buy", "sell")): rng.randrange(1, 500)} for _ in range(count)]
+
+
+def measure_transaction_memory(count: int = 200_000, batch_size: int = 10_000) -> None:
+    """Memoria retenida por operación: columnas del flujo frente a filas dict."""
+    rng = random.Random(11)
+    tracemalloc.start()
+    rows = []
+    for _ in range(count // batch_size):
+        rows.extend(make_trades(rng, batch_size))
+    row_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+
+    tracemalloc.start()
+    stream = TransactionStream("MEMORY")
+    for _ in range(count // batch_size):
+        stream.process_batch(make_trades(rng, batch_size))
+    column_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"    retained per transaction: columns {column_memory / count:.0f} B, "
+        f"dict rows {row_memory / count:.0f} B"
+    )
+
+
+def bench_transactions(count: int, batch_size: int = 10_000) -> None:
+    rng = random.Random(7)
+    stream = TransactionStream("BENCH")
+    # Filas de referencia: el flujo ya no guarda los diccionarios
+    rows = []
+    for _ in range(max(1, count // batch_size)):
+        batch = make_trades(rng, batch_size)
+        stream.process_batch(batch)
+        rows.extend(batch)
+    total = len(stream.transactions)
+
+    runs = [
+        ("row scan (dict rows)", lambda: scan_large(rows, 250)),
+        ("column scan find_large", lambda: stream.find_large(250)),
+        ("column filter_data", lambda: stream.filter_data("high")),
+        ("window_aggregates 1s", lambda: stream.window_aggregates(1.0)),
+    ]
+    print(f"Transactions: {total:,}")
+    for label, run in runs:
+        start = time.perf_counter()
+        found = len(run())
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"    {label:<26} {found:>10,} rows  {elapsed:9.2f} ms")
+    del rows
+    measure_transaction_memory()
+
+
+def bench_spill(count: int, batch_size: int = 10_000, segment: int = 250_000) -> None:
+    rng = random.Random(3)
+    factories = [
+        (SensorStream, lambda: {"temp": rng.randrange(0, 45), "humidity": 60}),
+        (TransactionStream, lambda: {rng.choice(("buy", "sell")): rng.randrange(1, 500)}),
+        (EventStream, lambda: rng.choice(("user login", "ERROR: disk full", "logout"))),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        for stream_class, make in factories:
+            name = stream_class.__name__
+            batch = [make() for _ in range(batch_size)]
+            stream = stream_class("SPILL")
+            stream.enable_spill(directory, segment)
+            start = time.perf_counter()
+            for _ in range(max(1, count // batch_size)):
+                stream.process_batch(batch)
+            stream.flush_spill()
+            ingest_time = time.perf_counter() - start
+            report(f"spill ingest {name}", ingest_time, 0)
+
+            start = time.perf_counter()
+            found = len(stream.filter_data("high"))
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"    filter_data('high') over {len(stream.segments)} segments: "
+                  f"{found:,} hits  {elapsed:9.2f} ms")
+
+            # Referencia con 1M registros: replay x11 (Sensor) y x23
+            # (Transaction) frente a la ingesta; Event tarda ~1 ms, pues la
+            # cabecera de cada segmento ya da el número de errores
+            processor = StreamProcessor()
+            processor.add_stream(stream_class("SPILL"))
+            start = time.perf_counter()
+            loaded = processor.replay(directory)
+            replay_time = time.perf_counter() - start
+            report(f"replay {loaded:,} {name}", replay_time, 0)
+            print(f"    replay speedup x{ingest_time / replay_time:.1f}  "
+                  f"{processor.streams[0].analyze()}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    soak_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000_000
+    event_count = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000_000
+    transaction_count = int(sys.argv[4]) if len(sys.argv) > 4 else 5_000_000
+    spill_count = int(sys.argv[5]) if len(sys.argv) > 5 else 2_000_000
+    print("=== CODE NEXUS - STREAM BENCHMARK ===")
+    rng = random.Random(42)
+    # Centésimas de grado: cada buffer crea sus propios floats al ingerir
+    values = [rng.randrange(0, 4000) for _ in range(count)]
+
+    measure_buffer(values, typed=False)
+    measure_buffer(values, typed=True)
+    del values
+
+    bench_ingest()
+    bench_event_index(event_count)
+    bench_transactions(transaction_count)
+    bench_spill(spill_count)
+
+    for label in SOAK_POLICIES:
+        sys.stdout.flush()
+        run_soak(label, soak_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import random
+import tempfile
+import unittest
+
+from data_stream import (
+    CountWindow,
+    EventStream,
+    SensorStream,
+    StreamProcessor,
+    TransactionStream,
+    _percentiles,
+    compile_rule,
+    summarize_readings,
+)
+
+
+def reference_percentiles(values, quantiles):
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    results = []
+    for q in quantiles:
+        position = last * q
+        lower = int(position)
+        weight = position - lower
+        upper = ordered[min(lower + 1, last)]
+        results.append(ordered[lower] * (1 - weight) + upper * weight)
+    return results
+
+
+class PercentilesTest(unittest.TestCase):
+
+    def test_mixed_int_and_float_input(self):
+        # Long enough to take the sampled selection path
+        for seed in range(5):
+            rng = random.Random(seed)
+            values = [rng.randrange(100) for _ in range(100_000)]
+            values += [rng.random() * 100 for _ in range(100_000)]
+            rng.shuffle(values)
+            quantiles = (0.50, 0.95, 0.99)
+            self.assertEqual(
+                _percentiles(values, quantiles),
+                reference_percentiles(values, quantiles),
+            )
+
+    def test_summarize_mixed_readings(self):
+        summary = summarize_readings([20, 21.5] * 100_000)
+        self.assertEqual(summary["count"], 200_000)
+        self.assertEqual(summary["p50"], 20.75)
+        self.assertAlmostEqual(summary["stddev"], 0.75)
+
+
+class TransactionColumnsTest(unittest.TestCase):
+
+    TRANSACTIONS = [
+        {"buy": 100},
+        {"sell": 150.5},
+        {"buy": 2**60},
+        {"sell": 75, "fee": 120},
+        {"buy": True},
+        "malformed",
+        {"sell": 250},
+    ]
+
+    def test_rows_are_rebuilt_with_their_types(self):
+        stream = TransactionStream("TX")
+        stream.process_batch(self.TRANSACTIONS)
+        rows = stream.filter_data("all")
+        self.assertEqual(rows, self.TRANSACTIONS)
+        self.assertEqual(
+            [type(value) for row in rows[:3] for value in row.values()],
+            [int, float, int],
+        )
+        self.assertEqual(
+            stream.filter_data("high"),
+            [{"sell": 150.5}, {"buy": 2**60}, {"sell": 75, "fee": 120}, {"sell": 250}],
+        )
+        self.assertEqual(stream.find_large(200), [{"buy": 2**60}, {"sell": 250}])
+
+    def test_count_window_evicts_from_columns(self):
+        stream = TransactionStream("TX", CountWindow(3))
+        for transaction in self.TRANSACTIONS * 3:
+            stream.process_batch([transaction])
+        self.assertEqual(stream.filter_data("all"), self.TRANSACTIONS[-3:])
+        self.assertEqual(stream.buy_total, 1)
+        self.assertEqual(stream.sell_total, 250)
+
+
+class EventQueryTest(unittest.TestCase):
+
+    def test_count_window_query_returns_retained_events_in_order(self):
+        stream = EventStream("EVENTS", CountWindow(5))
+        events = [f"error {i}" if i % 3 == 0 else f"ok {i}" for i in range(12)]
+        for start in range(0, 12, 4):
+            stream.process_batch(events[start:start + 4])
+        self.assertEqual(stream.query(), events[-5:])
+        self.assertEqual(stream.query("error"), ["error 9"])
+        self.assertEqual(stream.query("OK"), ["ok 7", "ok 8", "ok 10", "ok 11"])
+        self.assertEqual(stream.filter_data("high"), ["error 9"])
+
+
+class SpillTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_event_segments_keep_errors_for_filter_and_replay(self):
+        events = [f"ERROR {i}" if i % 7 == 0 else f"ok {i}" for i in range(100)]
+        events[3] = {"error": "not a string"}
+        stream = EventStream("EVENTS")
+        stream.enable_spill(self.directory, 16)
+        for start in range(0, 100, 10):
+            stream.process_batch(events[start:start + 10])
+        errors = [event for event in events if isinstance(event, str)
+                  and "error" in event.lower()]
+        self.assertEqual(stream.filter_data("high"), errors)
+
+        stream.flush_spill()
+        processor = StreamProcessor()
+        replayed = EventStream("EVENTS")
+        processor.add_stream(replayed)
+        self.assertEqual(processor.replay(self.directory), 100)
+        self.assertEqual(replayed.error_count, len(errors))
+        self.assertEqual(replayed.filter_data("high"), errors)
+
+    def test_spilled_temperature_summary_matches_in_memory(self):
+        rng = random.Random(7)
+        readings = [{"temp": rng.random() * 40} for _ in range(300_000)]
+        readings[5] = {"humidity": 60}
+        spilled = SensorStream("SENSORS")
+        spilled.enable_spill(self.directory, 70_000)
+        in_memory = SensorStream("SENSORS")
+        for start in range(0, len(readings), 10_000):
+            spilled.process_batch(readings[start:start + 10_000])
+            in_memory.process_batch(readings[start:start + 10_000])
+        self.assertGreater(len(spilled.segments), 1)
+        summary = spilled.get_temperature_summary()
+        expected = in_memory.get_temperature_summary()
+        self.assertEqual(summary.keys(), expected.keys())
+        for key, value in expected.items():
+            self.assertAlmostEqual(summary[key], value)
+
+
+class SubscriptionTest(unittest.TestCase):
+
+    def test_direct_process_batch_dispatches(self):
+        processor = StreamProcessor()
+        stream = SensorStream("SENSORS")
+        processor.add_stream(stream)
+        hot = processor.subscribe("hot", "temp > 30")
+        stream.process_batch([{"temp": 35}, {"temp": 20}])
+        processor.process_all([[{"temp": 40}]])
+        self.assertEqual(hot.drain(), [{"temp": 35}, {"temp": 40}])
+
+    def test_rule_cache_is_bounded(self):
+        self.assertIsNotNone(compile_rule.cache_info().maxsize)
+        self.assertIs(compile_rule("temp > 30"), compile_rule("temp > 30"))
+
+
+if __name__ == "__main__":
+    unittest.main()
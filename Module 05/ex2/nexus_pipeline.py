@@ -1,15 +1,133 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
-from collections import defaultdict
+from array import array
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from bisect import bisect_left
+from itertools import compress, islice, repeat
+import asyncio
+import csv
+import io
+import json
+import math
+import operator
+import os
+import threading
 import time
 
+Source = Union[str, "os.PathLike[str]", BinaryIO]
+
 
 class ProcessingStage(ABC):
 
+    # Una etapa sin estado no tiene efectos entre registros y devuelve sin
+    # cambios los resultados con error, por lo que compile() puede
+    # fusionarla con la anterior sin comprobar errores entre ambas.
+    stateless = False
+
     @abstractmethod
     def execute(self, data: Any) -> Any:
         pass
 
+    def execute_batch(self, batch: List[Any]) -> List[Any]:
+        """
+        Procesa un lote completo de registros.
+        Por defecto delega en execute() registro a registro y deja pasar
+        sin cambios los resultados con error, que execute() ya no
+        llevaría a esta etapa. Las etapas pueden sobrescribirlo para
+        amortizar trabajo común del lote; si lanza una excepción, la
+        canalización repite la etapa registro a registro.
+        """
+        execute = self.execute
+        return [data if _is_error(data) else execute(data) for data in batch]
+
+    @abstractmethod
+    def get_stage_name(self) -> str:
+        pass
+
+    @abstractmethod
+    def get_stage_description(self) -> str:
+        pass
+
+
+class Record:
+    """
+    Sobre de un registro que las etapas modifican en el sitio.
+    Sustituye a los diccionarios anidados que cada etapa reconstruye:
+    un único objeto por registro con metadatos planos y campo de error.
+    """
+
+    __slots__ = (
+        "data",
+        "validated",
+        "enriched",
+        "timestamp",
+        "stage",
+        "status",
+        "error",
+        "metadata",
+    )
+
+    def __init__(self, data: Any):
+        """
+        Inicializa el sobre.
+
+        Args:
+            data: Datos originales del registro
+        """
+        self.data = data
+        self.validated = False
+        self.enriched = False
+        self.timestamp = 0.0
+        self.stage = None
+        self.status = None
+        self.error = None
+        # Metadatos adicionales; el diccionario se crea solo si se usa
+        self.metadata = None
+
+    def set_metadata(self, key: str, value: Any) -> None:
+        """Añade un metadato adicional al registro."""
+        if self.metadata is None:
+            self.metadata = {}
+        self.metadata[key] = value
+
+    def fail(self, stage: str, error: str) -> "Record":
+        """Marca el registro como fallido en la etapa indicada."""
+        self.stage = stage
+        self.status = "error"
+        self.error = error
+        return self
+
+    def __repr__(self) -> str:
+        return (
+            f"Record(stage={self.stage!r}, status={self.status!r}, "
+            f"error={self.error!r}, data={self.data!r})"
+        )
+
+
+class AsyncProcessingStage(ABC):
+    """
+    Etapa asíncrona para enriquecimientos limitados por E/S.
+    La canalización la espera en lugar de bloquear el bucle de eventos.
+    """
+
+    @abstractmethod
+    async def execute(self, data: Any) -> Any:
+        pass
+
     @abstractmethod
     def get_stage_name(self) -> str:
         pass
@@ -27,6 +145,13 @@ class InputStage(ProcessingStage):
 
     def execute(self, data: Any) -> Any:
         """Valida y parsea los datos de entrada."""
+        if isinstance(data, Record):
+            if data.data is None:
+                data.validated = False
+                return data.fail("input", "Input data cannot be None")
+            data.validated = True
+            data.stage = "input"
+            return data
         try:
             # Validación básica
             if data is None:
@@ -35,6 +160,16 @@ class InputStage(ProcessingStage):
         except Exception as e:
             return {"validated": False, "error": str(e), "stage": "input"}
 
+    def execute_batch(self, batch: List[Any]) -> List[Any]:
+        """Valida un lote; los datos crudos válidos se envuelven en línea."""
+        execute = self.execute
+        return [
+            execute(data)
+            if data is None or isinstance(data, Record)
+            else {"validated": True, "data": data, "stage": "input"}
+            for data in batch
+        ]
+
     def get_stage_name(self) -> str:
         """Retorna el nombre de la etapa."""
         return "Input Stage"
@@ -49,13 +184,25 @@ class TransformStage(ProcessingStage):
     Etapa de transformación: enriquecimiento y procesamiento de datos.
     """
 
+    stateless = True
+
     def __init__(self):
         """Inicializa la etapa de transformación."""
         pass
 
     def execute(self, data: Any) -> Any:
         """Transforma y enriquece los datos."""
+        if isinstance(data, Record):
+            if data.error:
+                return data
+            if not data.validated:
+                return data.fail("transform", "Invalid data for transformation")
+            data.enriched = True
+            data.timestamp = time.time()
+            data.stage = "transform"
+            return data
         try:
+            # El caso válido va primero: es el camino de cada registro
             if isinstance(data, dict) and data.get("validated"):
                 original_data = data.get("data")
                 # Transformación y enriquecimiento
@@ -66,11 +213,44 @@ class TransformStage(ProcessingStage):
                     "stage": "transform",
                 }
                 return transformed
+            elif _is_error(data):
+                return data
             else:
                 raise ValueError("Invalid data for transformation")
         except Exception as e:
             return {"error": str(e), "stage": "transform"}
 
+    def execute_batch(self, batch: List[Any]) -> List[Any]:
+        """Transforma un lote con una única marca de tiempo compartida."""
+        timestamp = time.time()
+        results = []
+        for data in batch:
+            # Mismo orden que execute(): el caso válido va primero
+            if isinstance(data, dict) and data.get("validated"):
+                results.append(
+                    {
+                        "original": data.get("data"),
+                        "enriched": True,
+                        "metadata": {"timestamp": timestamp, "stage": "transform"},
+                        "stage": "transform",
+                    }
+                )
+            elif _is_error(data):
+                results.append(data)
+            elif isinstance(data, Record):
+                if data.validated:
+                    data.enriched = True
+                    data.timestamp = timestamp
+                    data.stage = "transform"
+                else:
+                    data.fail("transform", "Invalid data for transformation")
+                results.append(data)
+            else:
+                results.append(
+                    {"error": "Invalid data for transformation", "stage": "transform"}
+                )
+        return results
+
     def get_stage_name(self) -> str:
         """Retorna el nombre de la etapa."""
         return "Transform Stage"
@@ -86,14 +266,23 @@ class OutputStage(ProcessingStage):
     Etapa de salida: formateo y entrega de datos.
     """
 
+    stateless = True
+
     def __init__(self):
         """Inicializa la etapa de salida."""
         pass
 
     def execute(self, data: Any) -> Any:
         """Formatea y prepara los datos para salida."""
+        if isinstance(data, Record):
+            if not data.error:
+                data.status = "success"
+                data.stage = "output"
+            return data
         try:
             if isinstance(data, dict):
+                if data.get("error"):
+                    return data
                 # Formateo de salida
                 output = {
                     "status": "success",
@@ -107,6 +296,16 @@ class OutputStage(ProcessingStage):
         except Exception as e:
             return {"status": "error", "error": str(e), "stage": "output"}
 
+    def execute_batch(self, batch: List[Any]) -> List[Any]:
+        """Formatea un lote; los diccionarios válidos se envuelven en línea."""
+        execute = self.execute
+        return [
+            {"status": "success", "processed": True, "result": data, "stage": "output"}
+            if isinstance(data, dict) and not data.get("error")
+            else execute(data)
+            for data in batch
+        ]
+
     def get_stage_name(self) -> str:
         """Retorna el nombre de la etapa."""
         return "Output Stage"
@@ -116,21 +315,235 @@ class OutputStage(ProcessingStage):
         return "Output formatting and delivery"
 
 
+# Límites superiores de los buckets en ns: de 1 µs a ~8.4 s en potencias de 2
+LATENCY_BUCKETS_NS = [1_000 << i for i in range(24)]
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con buckets fijos.
+    Registrar una muestra es una búsqueda binaria y un incremento.
+    """
+
+    def __init__(self, bounds_ns: List[int] = LATENCY_BUCKETS_NS):
+        """
+        Inicializa el histograma.
+
+        Args:
+            bounds_ns: Límites superiores de los buckets en nanosegundos
+        """
+        self.bounds_ns = bounds_ns
+        # El último bucket recoge las muestras por encima del mayor límite
+        self.counts = [0] * (len(bounds_ns) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe(self, value_ns: int, samples: int = 1) -> None:
+        """Registra una latencia, opcionalmente para varias muestras."""
+        self.counts[bisect_left(self.bounds_ns, value_ns)] += samples
+        self.count += samples
+        self.total_ns += value_ns * samples
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def observe_many(self, values_ns: List[int]) -> None:
+        """Registra varias latencias de una vez."""
+        if not values_ns:
+            return
+        counts = self.counts
+        bounds = self.bounds_ns
+        # Las latencias en ns se repiten mucho: se agrupan en C y solo se
+        # busca el bucket una vez por valor distinto
+        for value_ns, samples in Counter(values_ns).items():
+            counts[bisect_left(bounds, value_ns)] += samples
+        self.count += len(values_ns)
+        self.total_ns += sum(values_ns)
+        self.max_ns = max(self.max_ns, max(values_ns))
+
+    def percentile(self, q: float) -> int:
+        """Retorna el límite del bucket que contiene el percentil q (0-1)."""
+        if self.count == 0:
+            return 0
+        target = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                if i < len(self.bounds_ns):
+                    return min(self.bounds_ns[i], self.max_ns)
+                break
+        return self.max_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Acumula otro histograma con los mismos buckets."""
+        for i, bucket_count in enumerate(other.counts):
+            self.counts[i] += bucket_count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+
+# Muestras por etapa que execute() acumula antes de volcarlas al histograma
+STAGE_SAMPLES_FLUSH = 4096
+
+
+class StageMetrics:
+    """
+    Métricas de una etapa: registros de entrada y salida y latencias.
+    execute() solo añade la latencia en bruto a pending (y cuenta los
+    fallos en pending_failed); flush() lo vuelca al histograma por lotes.
+    """
+
+    def __init__(self, stage_name: str):
+        self.stage_name = stage_name
+        self.records_in = 0
+        self.records_out = 0
+        self.latency = LatencyHistogram()
+        self.pending = []
+        self.pending_failed = 0
+
+    def record(self, elapsed_ns: int, records_in: int, records_out: int) -> None:
+        """Registra una ejecución de la etapa sobre records_in registros."""
+        self.records_in += records_in
+        self.records_out += records_out
+        if records_in:
+            self.latency.observe(elapsed_ns // records_in, records_in)
+
+    def flush(self) -> None:
+        """Vuelca las latencias pendientes de execute() al histograma."""
+        pending = self.pending
+        if not pending:
+            return
+        self.records_in += len(pending)
+        self.records_out += len(pending) - self.pending_failed
+        self.latency.observe_many(pending)
+        self.pending = []
+        self.pending_failed = 0
+
+    def merge(self, other: "StageMetrics") -> None:
+        """Acumula las métricas de la misma etapa en otro proceso."""
+        self.flush()
+        other.flush()
+        self.records_in += other.records_in
+        self.records_out += other.records_out
+        self.latency.merge(other.latency)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Retorna el resumen de la etapa con percentiles en milisegundos."""
+        self.flush()
+        return {
+            "stage": self.stage_name,
+            "records_in": self.records_in,
+            "records_out": self.records_out,
+            "p50_ms": self.latency.percentile(0.50) / 1e6,
+            "p95_ms": self.latency.percentile(0.95) / 1e6,
+            "p99_ms": self.latency.percentile(0.99) / 1e6,
+            "total_ms": self.latency.total_ns / 1e6,
+        }
+
+
+def _label_value(value: Any) -> str:
+    """Escapa un valor de etiqueta según el formato de texto Prometheus."""
+    return (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def _is_error(result: Any) -> bool:
+    if isinstance(result, Record):
+        return bool(result.error)
+    return isinstance(result, dict) and bool(result.get("error"))
+
+
+class CompiledPipeline:
+    """
+    Plan compilado de una canalización: los métodos execute de las etapas
+    se resuelven una sola vez, las etapas sin estado consecutivas se
+    fusionan y la comprobación de errores solo se hace al final de cada
+    grupo. Se comporta como ProcessingPipeline.execute y actualiza sus
+    estadísticas globales, pero no mide latencias por etapa.
+    """
+
+    def __init__(self, pipeline: "ProcessingPipeline"):
+        """
+        Compila las etapas actuales de la canalización.
+        Las etapas añadidas después no forman parte del plan.
+
+        Args:
+            pipeline: Canalización a compilar
+        """
+        pipeline.check_sync()
+        self.pipeline = pipeline
+        self.groups = []
+        for stage in pipeline.stages:
+            if self.groups and stage.stateless:
+                self.groups[-1].append(stage)
+            else:
+                self.groups.append([stage])
+        self._plan = tuple(
+            tuple(stage.execute for stage in group) for group in self.groups
+        )
+
+    def __call__(self, data: Any) -> Any:
+        """Ejecuta el plan sobre un registro."""
+        statistics = self.pipeline.statistics
+        start_time = time.time()
+        result = data
+
+        try:
+            for group in self._plan:
+                for execute in group:
+                    result = execute(result)
+
+                if isinstance(result, dict):
+                    if result.get("error"):
+                        statistics["failed"] += 1
+                        break
+                elif isinstance(result, Record) and result.error:
+                    statistics["failed"] += 1
+                    break
+            else:
+                statistics["successful"] += 1
+
+        except Exception as e:
+            result = {"error": str(e), "pipeline": self.pipeline.pipeline_id}
+            statistics["failed"] += 1
+
+        statistics["total_processed"] += 1
+        statistics["processing_time"] += time.time() - start_time
+        return result
+
+    execute = __call__
+
+    def describe(self) -> List[str]:
+        """Retorna los grupos fusionados con los nombres de sus etapas."""
+        return [
+            " + ".join(stage.get_stage_name() for stage in group)
+            for group in self.groups
+        ]
+
+
 class ProcessingPipeline:
     """
     Canalización de procesamiento con etapas configurables.
     Base flexible para diferentes tipos de procesamiento.
     """
 
-    def __init__(self, pipeline_id: str):
+    def __init__(self, pipeline_id: str, stage_timing: bool = False):
         """
         Inicializa la canalización de procesamiento.
 
         Args:
             pipeline_id: Identificador único de la canalización
+            stage_timing: Si es True se miden latencias por etapa
         """
         self.pipeline_id = pipeline_id
+        self.stage_timing = stage_timing
         self.stages = []
+        self.stage_metrics = []
+        # Etapas asíncronas: solo execute_async sabe esperarlas
+        self.async_stages = 0
         self.statistics = {
             "total_processed": 0,
             "successful": 0,
@@ -138,7 +551,9 @@ class ProcessingPipeline:
             "processing_time": 0.0,
         }
 
-    def add_stage(self, stage: ProcessingStage) -> None:
+    def add_stage(
+        self, stage: Union[ProcessingStage, AsyncProcessingStage]
+    ) -> None:
         """
         Añade una etapa a la canalización.
 
@@ -146,6 +561,26 @@ class ProcessingPipeline:
             stage: Etapa de procesamiento a añadir
         """
         self.stages.append(stage)
+        self.stage_metrics.append(StageMetrics(stage.get_stage_name()))
+        if isinstance(stage, AsyncProcessingStage):
+            self.async_stages += 1
+
+    def check_sync(self) -> None:
+        """Rechaza la ejecución síncrona si alguna etapa es asíncrona."""
+        if self.async_stages:
+            raise TypeError(
+                f"Pipeline {self.pipeline_id} has async stages; "
+                "use execute_async() or execute_many_async()"
+            )
+
+    def reset_statistics(self) -> None:
+        """Pone a cero las estadísticas globales y por etapa."""
+        for key in self.statistics:
+            self.statistics[key] = 0
+        self.statistics["processing_time"] = 0.0
+        self.stage_metrics = [
+            StageMetrics(stage.get_stage_name()) for stage in self.stages
+        ]
 
     def execute(self, data: Any) -> Any:
         """
@@ -157,7 +592,14 @@ class ProcessingPipeline:
 
         Returns:
             Resultado del procesamiento
+
+        Raises:
+            TypeError: Si la canalización tiene etapas asíncronas
         """
+        self.check_sync()
+        if self.stage_timing:
+            return self._execute_timed(data)
+
         start_time = time.time()
         result = data
 
@@ -167,7 +609,171 @@ class ProcessingPipeline:
                 result = stage.execute(result)
 
                 # Si hay error, detener el procesamiento
-                if isinstance(result, dict) and result.get("error"):
+                if isinstance(result, dict):
+                    if result.get("error"):
+                        self.statistics["failed"] += 1
+                        break
+                elif isinstance(result, Record) and result.error:
+                    self.statistics["failed"] += 1
+                    break
+            else:
+                self.statistics["successful"] += 1
+
+            self.statistics["total_processed"] += 1
+
+        except Exception as e:
+            result = {"error": str(e), "pipeline": self.pipeline_id}
+            self.statistics["failed"] += 1
+            self.statistics["total_processed"] += 1
+
+        finally:
+            processing_time = time.time() - start_time
+            self.statistics["processing_time"] += processing_time
+
+        return result
+
+    def _execute_timed(self, data: Any) -> Any:
+        """
+        execute() con latencias por etapa: solo se guarda la diferencia
+        de perf_counter_ns; el histograma se actualiza en flush().
+        """
+        start_time = time.time()
+        now = time.perf_counter_ns
+        result = data
+
+        try:
+            previous = now()
+            for stage, metrics in zip(self.stages, self.stage_metrics):
+                result = stage.execute(result)
+                current = now()
+                metrics.pending.append(current - previous)
+                previous = current
+
+                if isinstance(result, dict):
+                    if not result.get("error"):
+                        continue
+                elif not (isinstance(result, Record) and result.error):
+                    continue
+                metrics.pending_failed += 1
+                self.statistics["failed"] += 1
+                break
+            else:
+                self.statistics["successful"] += 1
+
+            self.statistics["total_processed"] += 1
+
+        except Exception as e:
+            result = {"error": str(e), "pipeline": self.pipeline_id}
+            self.statistics["failed"] += 1
+            self.statistics["total_processed"] += 1
+
+        finally:
+            self.statistics["processing_time"] += time.time() - start_time
+            if (
+                self.stage_metrics
+                and len(self.stage_metrics[0].pending) >= STAGE_SAMPLES_FLUSH
+            ):
+                for metrics in self.stage_metrics:
+                    metrics.flush()
+
+        return result
+
+    def execute_batch(self, records: List[Any]) -> List[Any]:
+        """
+        Ejecuta la canalización sobre un lote de registros.
+        Cada etapa recorre el lote completo una sola vez (los resultados
+        con error la atraviesan sin cambios) y las estadísticas se
+        actualizan una sola vez por lote. Los resultados coinciden con
+        los de execute() registro a registro.
+
+        Args:
+            records: Registros a procesar
+
+        Returns:
+            Resultados en el mismo orden que la entrada
+
+        Raises:
+            TypeError: Si la canalización tiene etapas asíncronas
+        """
+        self.check_sync()
+        start_time = time.time()
+        results = list(records)
+        failed = 0
+
+        try:
+            for stage, metrics in zip(self.stages, self.stage_metrics):
+                stage_start = time.perf_counter_ns()
+                try:
+                    results = stage.execute_batch(results)
+                except Exception:
+                    results = self._execute_stage_per_record(stage, results)
+                if self.stage_timing:
+                    elapsed_ns = time.perf_counter_ns() - stage_start
+                    now_failed = sum(map(_is_error, results))
+                    metrics.record(
+                        elapsed_ns, len(results) - failed, len(results) - now_failed
+                    )
+                    failed = now_failed
+            if self.stages and not self.stage_timing:
+                failed = sum(map(_is_error, results))
+
+        finally:
+            self.statistics["total_processed"] += len(results)
+            self.statistics["successful"] += len(results) - failed
+            self.statistics["failed"] += failed
+            self.statistics["processing_time"] += time.time() - start_time
+
+        return results
+
+    def _execute_stage_per_record(
+        self, stage: ProcessingStage, batch: List[Any]
+    ) -> List[Any]:
+        """
+        Repite una etapa registro a registro tras una excepción en su
+        execute_batch(): solo fallan los registros que la provocan, con
+        el mismo error que devolvería execute().
+        """
+        results = []
+        for data in batch:
+            if _is_error(data):
+                results.append(data)
+                continue
+            try:
+                results.append(stage.execute(data))
+            except Exception as e:
+                results.append({"error": str(e), "pipeline": self.pipeline_id})
+        return results
+
+    async def execute_async(self, data: Any) -> Any:
+        """
+        Ejecuta la canalización dentro del bucle de eventos.
+        Las etapas asíncronas se esperan y las síncronas se ejecutan en
+        el executor por defecto para no bloquear el bucle.
+
+        Args:
+            data: Datos a procesar
+
+        Returns:
+            Resultado del procesamiento
+        """
+        loop = asyncio.get_running_loop()
+        start_time = time.time()
+        result = data
+
+        try:
+            for stage, metrics in zip(self.stages, self.stage_metrics):
+                stage_start = time.perf_counter_ns()
+                if isinstance(stage, AsyncProcessingStage):
+                    result = await stage.execute(result)
+                else:
+                    result = await loop.run_in_executor(None, stage.execute, result)
+                failed = _is_error(result)
+                if self.stage_timing:
+                    metrics.record(
+                        time.perf_counter_ns() - stage_start, 1, 0 if failed else 1
+                    )
+
+                if failed:
                     self.statistics["failed"] += 1
                     break
             else:
@@ -186,6 +792,38 @@ class ProcessingPipeline:
 
         return result
 
+    async def execute_many_async(
+        self, records: List[Any], max_in_flight: int = 100
+    ) -> List[Any]:
+        """
+        Ejecuta varios registros con un máximo de registros en vuelo.
+
+        Args:
+            records: Registros a procesar
+            max_in_flight: Registros procesándose a la vez como máximo
+
+        Returns:
+            Resultados en el mismo orden que la entrada
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def run_one(data: Any) -> Any:
+            async with semaphore:
+                return await self.execute_async(data)
+
+        return await asyncio.gather(*(run_one(data) for data in records))
+
+    def compile(self) -> CompiledPipeline:
+        """
+        Compila las etapas actuales en un único plan fusionado.
+
+        Returns:
+            Plan invocable equivalente a execute()
+        """
+        return CompiledPipeline(self)
+
     def get_statistics(self) -> Dict[str, Any]:
         """Retorna las estadísticas de la canalización."""
         if self.statistics["total_processed"] > 0:
@@ -209,8 +847,15 @@ total_processed"
             "failed": self.statistics["failed"],
             "efficiency": efficiency,
             "total_time": self.statistics["processing_time"],
+            "stages": self.get_stage_statistics(),
         }
 
+    def get_stage_statistics(self) -> List[Dict[str, Any]]:
+        """Retorna el desglose por etapa; vacío si la medición está apagada."""
+        if not self.stage_timing:
+            return []
+        return [metrics.get_summary() for metrics in self.stage_metrics]
+
     def print_stages(self) -> None:
         """Imprime las etapas configuradas en la canalización."""
         for i, stage in enumerate(self.stages, 1):
@@ -247,6 +892,60 @@ class DataAdapter(ABC):
         """Retorna el tipo de formato manejado."""
         pass
 
+    def iter_records(self, source: Source) -> Iterator[Any]:
+        """
+        Genera los registros de un fichero de forma perezosa.
+        Por defecto el fichero completo es una sola entrada de
+        parse_input(); los formatos por líneas lo sobrescriben.
+        """
+        with _open_binary(source) as file:
+            yield self.parse_input(file.read().decode("utf-8"))
+
+    def iter_batches(self, source: Source, batch_size: int = 1000) -> Iterator[List[Any]]:
+        """
+        Agrupa los registros del fichero en lotes de tamaño fijo.
+        Solo hay un lote en memoria a la vez.
+        """
+        records = self.iter_records(source)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            yield batch
+
+
+def _original_data(processed_data: Any) -> Any:
+    """Extrae los datos originales de un Record o de la salida en dict."""
+    if isinstance(processed_data, Record):
+        return processed_data.data
+    if isinstance(processed_data, dict):
+        return processed_data.get("result", {}).get("original")
+    return None
+
+
+@contextmanager
+def _open_binary(source: Source) -> Iterator[BinaryIO]:
+    """Abre una ruta en modo binario o reutiliza un fichero ya abierto."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            yield file
+    else:
+        yield source
+
+
+def _coerce_value(value: str) -> Any:
+    """Convierte un campo CSV a int o float cuando es posible."""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    # "nan", "inf" o "infinity" se quedan como texto
+    return number if math.isfinite(number) else value
+
 
 class JSONAdapter(DataAdapter):
     """
@@ -259,23 +958,28 @@ class JSONAdapter(DataAdapter):
 
     def parse_input(self, raw_data: str) -> Dict[str, Any]:
         """Parsea string JSON a diccionario."""
-        # Simulación de parsing JSON
-        return {"sensor": "temp", "value": 23.5, "unit": "C"}
+        return json.loads(raw_data)
+
+    def iter_records(self, source: Source) -> Iterator[Any]:
+        """Lee NDJSON línea a línea: un documento JSON por línea."""
+        with _open_binary(source) as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
 
     def format_output(self, processed_data: Any) -> str:
         """Formatea datos procesados como output JSON."""
-        if isinstance(processed_data, dict):
-            original = processed_data.get("original", {})
-            if isinstance(original, dict):
-                value = original.get("value", 0)
-                unit = original.get("unit", "")
-                status = (
-                    "Normal range"
-                    if 15 <= value <= 30
-                    else "Out of \
+        original = _original_data(processed_data)
+        if isinstance(original, dict):
+            value = original.get("value", 0)
+            unit = original.get("unit", "")
+            status = (
+                "Normal range"
+                if 15 <= value <= 30
+                else "Out of \
 range"
-                )
-                return f"Processed temperature reading: \
+            )
+            return f"Processed temperature reading: \
 {value}°{unit} ({status})"
         return "Processed JSON data"
 
@@ -286,57 +990,346 @@ range"
 
 class CSVAdapter(DataAdapter):
 
-    def __init__(self, pipeline_id: str):
-        """Inicializa el adaptador CSV."""
+    def __init__(
+        self,
+        pipeline_id: str,
+        headers: Optional[List[str]] = None,
+        column_types: Optional[Dict[str, Callable[[str], Any]]] = None,
+    ):
+        """
+        Inicializa el adaptador CSV.
+
+        Args:
+            pipeline_id: Identificador de la canalización asociada
+            headers: Nombres de columna; si faltan se leen de la cabecera
+            column_types: Conversor por columna; el resto se infiere
+        """
         super().__init__(pipeline_id)
+        self.headers = headers
+        self.column_types = column_types or {}
 
     def parse_input(self, raw_data: str) -> Dict[str, Any]:
-        """Parsea string CSV a estructura de datos."""
-        # Simulación de parsing CSV
-        return {"format": "csv", "headers": ["user", "action", "timestamp"], "rows": 1}
+        """
+        Parsea string CSV a estructura de datos.
+        Sin cabeceras configuradas, la primera fila es la cabecera.
+        """
+        rows = [row for row in csv.reader(io.StringIO(raw_data)) if row]
+        headers = self.headers
+        if headers is None:
+            headers = rows.pop(0) if rows else []
+        return {"format": "csv", "headers": headers, "rows": len(rows)}
+
+    def iter_records(self, source: Source) -> Iterator[Dict[str, Any]]:
+        """Lee el CSV fila a fila y genera diccionarios con columnas tipadas."""
+        with _open_binary(source) as file:
+            text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+            try:
+                reader = csv.reader(text)
+                headers = self.headers or next(reader, None)
+                if headers is None:
+                    return
+                converters = [
+                    self.column_types.get(name, _coerce_value) for name in headers
+                ]
+                for row in reader:
+                    if row:
+                        yield {
+                            name: convert(value)
+                            for name, convert, value in zip(headers, converters, row)
+                        }
+            finally:
+                # No cerrar el fichero del llamador al liberar el envoltorio
+                text.detach()
 
     def format_output(self, processed_data: Any) -> str:
         """Formatea datos procesados como output CSV."""
-        if isinstance(processed_data, dict):
-            result = processed_data.get("result", {})
-            original = result.get("original", {})
-            if isinstance(original, dict):
-                rows = original.get("rows", 0)
-                return f"User activity logged: {rows} actions processed"
+        original = _original_data(processed_data)
+        if isinstance(original, dict):
+            rows = original.get("rows", 0)
+            return f"User activity logged: {rows} actions processed"
         return "Processed CSV data"
 
     def get_format_type(self) -> str:
         return "CSV"
 
 
+# Tamaño de la muestra que acota las posiciones buscadas en _order_statistics
+_SELECT_SAMPLE = 1 << 15
+
+
+def _order_statistics(values: Sequence[float], ranks: Iterable[int]) -> Dict[int, float]:
+    """
+    Valores en las posiciones ranks del orden ascendente sin ordenar una
+    copia de values: una muestra ordenada acota cada posición y solo se
+    ordena la franja de valores entre las dos cotas.
+    """
+    count = len(values)
+    ranks = sorted(set(ranks))
+    if count <= 4 * _SELECT_SAMPLE:
+        ordered = sorted(values)
+        return {rank: ordered[rank] for rank in ranks}
+    sample = sorted(values[::count // _SELECT_SAMPLE])
+    margin = 3 * math.isqrt(len(sample))
+    found = {}
+    for rank in ranks:
+        if rank in found:
+            continue
+        position = rank * len(sample) // count
+        low = sample[position - margin] if position >= margin else -math.inf
+        high = (
+            sample[position + margin]
+            if position + margin < len(sample)
+            else math.inf
+        )
+        # operator.* y no low.__gt__: int.__gt__(float) da NotImplemented
+        below = sum(map(operator.lt, values, repeat(low)))
+        inside = map(
+            operator.and_,
+            map(operator.ge, values, repeat(low)),
+            map(operator.le, values, repeat(high)),
+        )
+        band = sorted(compress(values, inside))
+        for other in ranks:
+            if below <= other < below + len(band):
+                found[other] = band[other - below]
+        if rank not in found:
+            # La muestra no acotó la posición: se ordena todo
+            ordered = sorted(values)
+            return {rank: ordered[rank] for rank in ranks}
+    return found
+
+
+def _percentiles(values: Sequence[float], quantiles: Sequence[float]) -> List[float]:
+    """Percentiles q (0-1) con interpolación lineal entre posiciones vecinas."""
+    last = len(values) - 1
+    positions = [last * q for q in quantiles]
+    ranks = []
+    for position in positions:
+        lower = math.floor(position)
+        ranks += [lower, min(lower + 1, last)]
+    found = _order_statistics(values, ranks)
+    results = []
+    for position in positions:
+        lower = math.floor(position)
+        weight = position - lower
+        upper = found[min(lower + 1, last)]
+        results.append(found[lower] * (1 - weight) + upper * weight)
+    return results
+
+
 class StreamAdapter(DataAdapter):
 
     def __init__(self, pipeline_id: str):
         super().__init__(pipeline_id)
 
     def parse_input(self, raw_data: str) -> Dict[str, Any]:
+        # Lecturas en buffer tipado: 8 bytes por valor en lugar de un float
+        readings = array("d", [22.5, 21.8, 22.0, 22.3, 21.9])
         return {
             "type": "stream",
-            "readings": [22.5, 21.8, 22.0, 22.3, 21.9],
-            "count": 5,
+            "readings": readings,
+            "count": len(readings),
+        }
+
+    def summarize(self, processed_data: Any) -> Dict[str, float]:
+        """
+        Resume las lecturas procesadas: media, mínimo, máximo,
+        desviación típica y percentiles, con pasadas nativas sobre el buffer
+        y sin convertirlo en una lista.
+        """
+        original = _original_data(processed_data)
+        readings = original.get("readings", ()) if isinstance(original, dict) else ()
+        count = len(readings)
+        if count == 0:
+            return {"count": 0}
+        mean = sum(readings) / count
+        # Dos pasadas: desviaciones respecto a la media ya calculada
+        deviations = map(operator.sub, readings, repeat(mean))
+        variance = math.fsum(map(operator.pow, deviations, repeat(2))) / count
+        p50, p95, p99 = _percentiles(readings, (0.50, 0.95, 0.99))
+        return {
+            "count": count,
+            "mean": mean,
+            "min": min(readings),
+            "max": max(readings),
+            "stddev": math.sqrt(variance),
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
         }
 
     def format_output(self, processed_data: Any) -> str:
-        if isinstance(processed_data, dict):
-            result = processed_data.get("result", {})
-            original = result.get("original", {})
-            if isinstance(original, dict):
-                readings = original.get("readings", [])
-                count = len(readings)
-                if readings:
-                    avg = sum(readings) / count
-                    return f"Stream summary: {count} readings, avg: {avg}°C"
+        original = _original_data(processed_data)
+        if isinstance(original, dict):
+            readings = original.get("readings", [])
+            count = len(readings)
+            if readings:
+                avg = sum(readings) / count
+                return f"Stream summary: {count} readings, avg: {avg}°C"
         return "Processed stream data"
 
     def get_format_type(self) -> str:
         return "Stream"
 
 
+class BoundedStageQueue:
+    """
+    Cola acotada entre etapas con marcas de agua alta y baja.
+    Al llegar a la marca alta el productor se bloquea hasta que el
+    consumidor la vacía por debajo de la marca baja.
+    """
+
+    def __init__(self, high_watermark: int = 1000, low_watermark: int = 500):
+        """
+        Inicializa la cola.
+
+        Args:
+            high_watermark: Profundidad a la que se aplica contrapresión
+            low_watermark: Profundidad a la que se libera al productor
+        """
+        if high_watermark < 1 or not 0 <= low_watermark < high_watermark:
+            raise ValueError("Watermarks must satisfy 0 <= low < high")
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._throttled = False
+        self.max_depth = 0
+        self.put_blocked_time = 0.0
+        self.get_blocked_time = 0.0
+
+    def put(self, item: Any) -> None:
+        """Añade un elemento, esperando si la cola está en contrapresión."""
+        with self._condition:
+            if len(self._items) >= self.high_watermark:
+                self._throttled = True
+            if self._throttled:
+                start_time = time.perf_counter()
+                self._condition.wait_for(lambda: not self._throttled)
+                self.put_blocked_time += time.perf_counter() - start_time
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._condition.notify_all()
+
+    def get(self) -> Any:
+        """Extrae el siguiente elemento, esperando si la cola está vacía."""
+        with self._condition:
+            if not self._items:
+                start_time = time.perf_counter()
+                self._condition.wait_for(lambda: self._items)
+                self.get_blocked_time += time.perf_counter() - start_time
+            item = self._items.popleft()
+            if self._throttled and len(self._items) <= self.low_watermark:
+                self._throttled = False
+                self._condition.notify_all()
+            return item
+
+    def depth(self) -> int:
+        """Retorna la profundidad actual de la cola."""
+        with self._condition:
+            return len(self._items)
+
+
+_END_OF_STREAM = object()
+
+
+class CheckpointStore:
+    """
+    Fichero de checkpoint con el último offset confirmado y una copia
+    de las estadísticas. Cada escritura sustituye el fichero de forma
+    atómica, así que tras un fallo siempre queda un checkpoint completo.
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa el almacén de checkpoints.
+
+        Args:
+            path: Ruta del fichero de checkpoint
+        """
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Retorna el último checkpoint o None si no existe."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def save(self, pipeline_id: str, offset: int, statistics: Dict[str, Any]) -> None:
+        """Escribe el checkpoint en un temporal y lo renombra encima."""
+        checkpoint = {
+            "pipeline_id": pipeline_id,
+            "offset": offset,
+            "statistics": statistics,
+            "saved_at": time.time(),
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(checkpoint, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        """Elimina el checkpoint para empezar desde el principio."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+_worker_adapter = None
+_worker_pipeline = None
+
+
+def _init_parallel_worker(
+    adapter: DataAdapter,
+    pipeline_id: str,
+    stages: List[ProcessingStage],
+    stage_timing: bool,
+) -> None:
+    """Recibe la configuración de etapas una sola vez por proceso."""
+    global _worker_adapter, _worker_pipeline
+    _worker_adapter = adapter
+    _worker_pipeline = ProcessingPipeline(pipeline_id, stage_timing)
+    for stage in stages:
+        _worker_pipeline.add_stage(stage)
+
+
+def _run_parallel_chunk(raw_chunk: List[str]) -> tuple:
+    """Procesa un fragmento de entradas y devuelve salidas y estadísticas."""
+    adapter = _worker_adapter
+    pipeline = _worker_pipeline
+    pipeline.reset_statistics()
+    statistics = pipeline.statistics
+    # Una entrada que falla al parsear o formatear cuenta como fallida
+    # sin perder el resto del fragmento
+    outputs = [None] * len(raw_chunk)
+    parsed = []
+    positions = []
+    for position, raw_data in enumerate(raw_chunk):
+        try:
+            parsed.append(Record(adapter.parse_input(raw_data)))
+        except Exception as e:
+            outputs[position] = f"Error: {str(e)}"
+            statistics["failed"] += 1
+            statistics["total_processed"] += 1
+        else:
+            positions.append(position)
+    processed = pipeline.execute_batch(parsed)
+    for position, result in zip(positions, processed):
+        try:
+            outputs[position] = adapter.format_output(result)
+        except Exception as e:
+            outputs[position] = f"Error: {str(e)}"
+            if not _is_error(result):
+                statistics["successful"] -= 1
+                statistics["failed"] += 1
+    return outputs, dict(statistics), pipeline.stage_metrics
+
+
 class NexusManager:
 
     def __init__(self):
@@ -344,6 +1337,8 @@ class NexusManager:
         self.pipelines = []
         self.capacity = 1000  # streams/second
         self.global_stats = defaultdict(int)
+        self.staged_chain = []
+        self.staged_queues = []
 
     def add_pipeline(self, pipeline: ProcessingPipeline) -> None:
         self.pipelines.append(pipeline)
@@ -355,7 +1350,8 @@ class NexusManager:
             parsed_data = adapter.parse_input(raw_data)
             print(f"Input: {raw_data}")
 
-            processed = pipeline.execute(parsed_data)
+            # Un único sobre por registro en lugar de un dict por etapa
+            processed = pipeline.execute(Record(parsed_data))
             print("Transform: Enriched with metadata and validation")
 
             output = adapter.format_output(processed)
@@ -371,13 +1367,307 @@ class NexusManager:
     def chain_pipelines(
         self, data: Any, pipeline_chain: List[ProcessingPipeline]
     ) -> Any:
+        for pipeline in pipeline_chain:
+            pipeline.check_sync()
         result = data
         for pipeline in pipeline_chain:
             result = pipeline.execute(result)
-            if isinstance(result, dict) and result.get("error"):
+            if _is_error(result):
                 break
         return result
 
+    def run_staged(
+        self,
+        records: List[Any],
+        pipeline_chain: List[ProcessingPipeline],
+        high_watermark: int = 1000,
+        low_watermark: int = 500,
+    ) -> List[Any]:
+        """
+        Ejecuta la cadena con cada canalización en su propio hilo,
+        conectadas por colas acotadas que aplican contrapresión.
+        Las métricas de colas se consultan con get_staged_statistics,
+        también mientras la ejecución está en curso.
+
+        Args:
+            records: Registros de entrada
+            pipeline_chain: Canalizaciones en orden
+            high_watermark: Marca alta de cada cola
+            low_watermark: Marca baja de cada cola
+
+        Returns:
+            Resultados en el mismo orden que la entrada
+        """
+        for pipeline in pipeline_chain:
+            pipeline.check_sync()
+        queues = [
+            BoundedStageQueue(high_watermark, low_watermark)
+            for _ in range(len(pipeline_chain) + 1)
+        ]
+        self.staged_chain = list(pipeline_chain)
+        self.staged_queues = queues
+
+        # Excepciones de los hilos, relanzadas al terminar. Cada hilo
+        # envía siempre el fin de flujo para que nadie espere para siempre.
+        errors = []
+
+        def feed() -> None:
+            try:
+                for data in records:
+                    queues[0].put(data)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                queues[0].put(_END_OF_STREAM)
+
+        def run_stage(pipeline: ProcessingPipeline, inbox, outbox) -> None:
+            try:
+                while True:
+                    data = inbox.get()
+                    if data is _END_OF_STREAM:
+                        return
+                    # Los registros con error atraviesan el resto sin procesar
+                    if _is_error(data):
+                        outbox.put(data)
+                    else:
+                        outbox.put(pipeline.execute(data))
+            except Exception as e:
+                errors.append(e)
+                # Se vacía la entrada para no bloquear las etapas anteriores
+                while inbox.get() is not _END_OF_STREAM:
+                    pass
+            finally:
+                outbox.put(_END_OF_STREAM)
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        for i, pipeline in enumerate(pipeline_chain):
+            threads.append(
+                threading.Thread(
+                    target=run_stage,
+                    args=(pipeline, queues[i], queues[i + 1]),
+                    daemon=True,
+                )
+            )
+        for thread in threads:
+            thread.start()
+
+        results = []
+        while True:
+            result = queues[-1].get()
+            if result is _END_OF_STREAM:
+                break
+            results.append(result)
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return results
+
+    def get_staged_statistics(self) -> List[Dict[str, Any]]:
+        """
+        Retorna las métricas por etapa de la última ejecución escalonada:
+        profundidad actual y máxima de su cola de entrada, tiempo
+        esperando datos y tiempo bloqueada por contrapresión aguas abajo.
+        """
+        queues = self.staged_queues
+        return [
+            {
+                "pipeline_id": pipeline.pipeline_id,
+                "input_queue_depth": queues[i].depth(),
+                "input_queue_max_depth": queues[i].max_depth,
+                "input_wait_time": queues[i].get_blocked_time,
+                "output_blocked_time": queues[i + 1].put_blocked_time,
+            }
+            for i, pipeline in enumerate(self.staged_chain)
+        ]
+
+    def run_parallel(
+        self,
+        adapter: DataAdapter,
+        pipeline: ProcessingPipeline,
+        raw_inputs: List[str],
+        workers: int = 4,
+    ) -> List[str]:
+        """
+        Procesa las entradas repartidas en un pool de procesos.
+        Las estadísticas de cada worker se fusionan en la canalización,
+        que queda registrada para get_global_statistics.
+
+        Args:
+            adapter: Adaptador de formato de las entradas
+            pipeline: Canalización cuya configuración se envía a los workers
+            raw_inputs: Entradas sin procesar
+            workers: Número de procesos
+
+        Returns:
+            Salidas formateadas en el mismo orden que la entrada
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        pipeline.check_sync()
+        raw_inputs = list(raw_inputs)
+        if not raw_inputs:
+            return []
+
+        # Varios fragmentos por worker para equilibrar la carga
+        chunk_size = max(1, -(-len(raw_inputs) // (workers * 4)))
+        chunks = [
+            raw_inputs[i:i + chunk_size]
+            for i in range(0, len(raw_inputs), chunk_size)
+        ]
+
+        outputs = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_parallel_worker,
+            initargs=(
+                adapter,
+                pipeline.pipeline_id,
+                pipeline.stages,
+                pipeline.stage_timing,
+            ),
+        ) as executor:
+            for chunk_outputs, chunk_stats, chunk_metrics in executor.map(
+                _run_parallel_chunk, chunks
+            ):
+                outputs.extend(chunk_outputs)
+                for key, value in chunk_stats.items():
+                    pipeline.statistics[key] += value
+                for metrics, worker_metrics in zip(
+                    pipeline.stage_metrics, chunk_metrics
+                ):
+                    metrics.merge(worker_metrics)
+
+        if pipeline not in self.pipelines:
+            self.add_pipeline(pipeline)
+        return outputs
+
+    def process_stream(
+        self,
+        adapter: DataAdapter,
+        pipeline: ProcessingPipeline,
+        source: Source,
+        batch_size: int = 1000,
+    ) -> Iterator[str]:
+        """
+        Procesa un fichero grande lote a lote sin cargarlo entero.
+
+        Args:
+            adapter: Adaptador con soporte de lectura incremental
+            pipeline: Canalización a ejecutar
+            source: Ruta o fichero binario abierto
+            batch_size: Registros por lote
+
+        Returns:
+            Generador de salidas formateadas en orden de entrada
+        """
+        for batch in adapter.iter_batches(source, batch_size):
+            for result in pipeline.execute_batch(list(map(Record, batch))):
+                yield adapter.format_output(result)
+
+    async def process_async(
+        self,
+        adapter: DataAdapter,
+        pipeline: ProcessingPipeline,
+        raw_inputs: List[str],
+        max_in_flight: int = 100,
+    ) -> List[str]:
+        """
+        Procesa las entradas de forma asíncrona mezclando etapas
+        síncronas y asíncronas en la misma canalización.
+
+        Args:
+            adapter: Adaptador de formato de las entradas
+            pipeline: Canalización a ejecutar
+            raw_inputs: Entradas sin procesar
+            max_in_flight: Registros procesándose a la vez como máximo
+
+        Returns:
+            Salidas formateadas en el mismo orden que la entrada
+        """
+        parsed = [Record(adapter.parse_input(raw_data)) for raw_data in raw_inputs]
+        processed = await pipeline.execute_many_async(parsed, max_in_flight)
+        return [adapter.format_output(result) for result in processed]
+
+    def run_checkpointed(
+        self,
+        records: Iterable[Any],
+        pipeline: ProcessingPipeline,
+        checkpoint_path: str,
+        every_records: Optional[int] = 1000,
+        every_seconds: Optional[float] = None,
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Procesa los registros guardando checkpoints periódicos.
+        Si existe un checkpoint de la misma canalización, se restauran
+        sus estadísticas y se reanuda desde el último offset confirmado.
+        El offset se confirma después de entregar el resultado, por lo que
+        tras un fallo algunos registros pueden repetirse (al menos una vez).
+        Si el consumidor cierra el generador antes de tiempo se guarda el
+        progreso entregado; al agotar la entrada el checkpoint se elimina
+        y la siguiente ejecución empieza desde el principio.
+
+        Args:
+            records: Registros de entrada, en el mismo orden en cada ejecución
+            pipeline: Canalización a ejecutar
+            checkpoint_path: Ruta del fichero de checkpoint
+            every_records: Registros entre checkpoints (None lo desactiva)
+            every_seconds: Segundos entre checkpoints (None lo desactiva)
+
+        Returns:
+            Generador de pares (offset, resultado)
+
+        Raises:
+            ValueError: Si every_records < 1 o every_seconds <= 0
+        """
+        if every_records is not None and every_records < 1:
+            raise ValueError("every_records must be at least 1")
+        if every_seconds is not None and every_seconds <= 0:
+            raise ValueError("every_seconds must be positive")
+        store = CheckpointStore(checkpoint_path)
+        offset = 0
+
+        checkpoint = store.load()
+        if checkpoint and checkpoint.get("pipeline_id") == pipeline.pipeline_id:
+            offset = checkpoint["offset"]
+            pipeline.statistics.update(checkpoint["statistics"])
+            print(f"Recovery: resuming {pipeline.pipeline_id} at offset {offset}")
+
+        committed = offset
+        last_save = time.monotonic()
+        completed = False
+        try:
+            for data in islice(records, offset, None):
+                result = pipeline.execute(data)
+                # Entregado cuenta como confirmado, aunque el consumidor
+                # cierre el generador en este yield
+                offset += 1
+                yield offset - 1, result
+
+                due = every_records is not None and offset - committed >= every_records
+                if not due and every_seconds is not None:
+                    due = time.monotonic() - last_save >= every_seconds
+                if due:
+                    store.save(pipeline.pipeline_id, offset, dict(pipeline.statistics))
+                    committed = offset
+                    last_save = time.monotonic()
+            completed = True
+        finally:
+            if completed:
+                store.clear()
+            elif offset != committed:
+                store.save(pipeline.pipeline_id, offset, dict(pipeline.statistics))
+
+    def reset_checkpoint(self, checkpoint_path: str) -> None:
+        """
+        Elimina el checkpoint para que run_checkpointed() empiece desde
+        el principio.
+
+        Args:
+            checkpoint_path: Ruta del fichero de checkpoint
+        """
+        CheckpointStore(checkpoint_path).clear()
+
     def simulate_error_recovery(self) -> None:
         print("Simulating pipeline failure...")
         print("Error detected in Stage 2: Invalid data format")
@@ -389,12 +1679,14 @@ class NexusManager:
         total_processed = 0
         total_successful = 0
         total_time = 0.0
+        stages = {}
 
         for pipeline in self.pipelines:
             stats = pipeline.get_statistics()
             total_processed += stats["total_processed"]
             total_successful += stats["successful"]
             total_time += stats["total_time"]
+            stages[pipeline.pipeline_id] = stats["stages"]
 
         efficiency = (
             (total_successful / total_processed * 100) if total_processed > 0 else 0
@@ -405,8 +1697,63 @@ class NexusManager:
             "total_successful": total_successful,
             "efficiency": efficiency,
             "total_time": total_time,
+            "stages": stages,
         }
 
+    def export_prometheus(self, path: str) -> None:
+        """
+        Escribe las métricas por etapa en formato de texto Prometheus.
+        El fichero se sustituye de forma atómica.
+
+        Args:
+            path: Ruta del fichero de salida
+        """
+        latency = "nexus_stage_latency_seconds"
+        lines = [
+            f"# HELP {latency} Per-record stage latency.",
+            f"# TYPE {latency} histogram",
+        ]
+        records_in = [
+            "# HELP nexus_stage_records_in_total Records received by the stage.",
+            "# TYPE nexus_stage_records_in_total counter",
+        ]
+        records_out = [
+            "# HELP nexus_stage_records_out_total Records passed on by the stage.",
+            "# TYPE nexus_stage_records_out_total counter",
+        ]
+
+        for pipeline in self.pipelines:
+            if not pipeline.stage_timing:
+                continue
+            for index, metrics in enumerate(pipeline.stage_metrics):
+                metrics.flush()
+                labels = (
+                    f'pipeline="{_label_value(pipeline.pipeline_id)}",'
+                    f'stage="{_label_value(metrics.stage_name)}",index="{index}"'
+                )
+                histogram = metrics.latency
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.bounds_ns, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'{latency}_bucket{{{labels},le="{bound / 1e9:g}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(f'{latency}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{latency}_sum{{{labels}}} {histogram.total_ns / 1e9:.9f}")
+                lines.append(f"{latency}_count{{{labels}}} {histogram.count}")
+                records_in.append(
+                    f"nexus_stage_records_in_total{{{labels}}} {metrics.records_in}"
+                )
+                records_out.append(
+                    f"nexus_stage_records_out_total{{{labels}}} {metrics.records_out}"
+                )
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines + records_in + records_out) + "\n")
+        os.replace(temp_path, path)
+
 
 def main():
     print("=== CODE NEXUS - ENTERPRISE PIPELINE SYSTEM ===")
@@ -439,7 +1786,7 @@ def main():
     print()
 
     print("Processing CSV data through same pipeline...")
-    csv_adapter = CSVAdapter("CSV_PIPE")
+    csv_adapter = CSVAdapter("CSV_PIPE", headers=["user", "action", "timestamp"])
     manager.process_with_adapter(csv_adapter, pipeline, '"user,action,timestamp"')
     print()
 
@@ -462,7 +1809,7 @@ def main():
     pipeline_c.add_stage(OutputStage())
 
     for _ in range(100):
-        test_data = {"test": "data"}
+        test_data = Record({"test": "data"})
         manager.chain_pipelines(test_data, [pipeline_a, pipeline_b, pipeline_c])
 
     print("Chain result: 100 records processed through 3-stage pipeline")
@@ -0,0 +1,240 @@
+import asyncio
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from nexus_pipeline import (
+    AsyncProcessingStage,
+    CSVAdapter,
+    InputStage,
+    NexusManager,
+    OutputStage,
+    ProcessingPipeline,
+    ProcessingStage,
+    Record,
+    StreamAdapter,
+    TransformStage,
+    _percentiles,
+)
+
+
+def reference_percentiles(values, quantiles):
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    results = []
+    for q in quantiles:
+        position = last * q
+        lower = int(position)
+        weight = position - lower
+        upper = ordered[min(lower + 1, last)]
+        results.append(ordered[lower] * (1 - weight) + upper * weight)
+    return results
+
+
+class PercentilesTest(unittest.TestCase):
+
+    def test_mixed_int_and_float_input(self):
+        # Long enough to take the sampled selection path
+        for seed in range(5):
+            rng = random.Random(seed)
+            values = [rng.randrange(100) for _ in range(100_000)]
+            values += [rng.random() * 100 for _ in range(100_000)]
+            rng.shuffle(values)
+            quantiles = (0.50, 0.95, 0.99)
+            self.assertEqual(
+                _percentiles(values, quantiles),
+                reference_percentiles(values, quantiles),
+            )
+
+    def test_summarize_mixed_readings(self):
+        readings = [20, 21.5] * 100_000
+        summary = StreamAdapter("STREAM").summarize(
+            Record({"readings": readings})
+        )
+        self.assertEqual(summary["min"], 20)
+        self.assertEqual(summary["max"], 21.5)
+        self.assertEqual(summary["p50"], 20.75)
+
+
+class TagStage(AsyncProcessingStage):
+
+    async def execute(self, data):
+        data["tagged"] = True
+        return data
+
+    def get_stage_name(self):
+        return "tag"
+
+    def get_stage_description(self):
+        return "Tag records"
+
+
+class AsyncStageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pipeline = ProcessingPipeline("MIXED")
+        self.pipeline.add_stage(InputStage())
+        self.pipeline.add_stage(TagStage())
+
+    def test_sync_entry_points_reject_async_stages(self):
+        manager = NexusManager()
+        calls = [
+            lambda: self.pipeline.execute({"value": 1}),
+            lambda: self.pipeline.execute_batch([{"value": 1}]),
+            lambda: self.pipeline.compile(),
+            lambda: manager.chain_pipelines({"value": 1}, [self.pipeline]),
+            lambda: manager.run_staged([{"value": 1}], [self.pipeline]),
+        ]
+        for call in calls:
+            with self.assertRaises(TypeError):
+                call()
+        self.assertEqual(self.pipeline.statistics["total_processed"], 0)
+
+    def test_execute_async_awaits_async_stages(self):
+        result = asyncio.run(self.pipeline.execute_async({"value": 1}))
+        self.assertTrue(result["tagged"])
+
+
+class FailOnThreeStage(ProcessingStage):
+
+    def execute(self, data):
+        if data["result"]["original"] == 3:
+            raise RuntimeError("three")
+        return data
+
+    def get_stage_name(self):
+        return "fail on three"
+
+    def get_stage_description(self):
+        return "Raise for one record"
+
+
+def without_timestamps(result):
+    if not isinstance(result, dict):
+        return result
+    return {
+        key: without_timestamps(value)
+        for key, value in result.items()
+        if key != "timestamp"
+    }
+
+
+class ExecuteBatchTest(unittest.TestCase):
+
+    def build(self, stage_timing):
+        pipeline = ProcessingPipeline("BATCH", stage_timing)
+        pipeline.add_stage(InputStage())
+        pipeline.add_stage(TransformStage())
+        pipeline.add_stage(OutputStage())
+        pipeline.add_stage(FailOnThreeStage())
+        return pipeline
+
+    def test_matches_execute(self):
+        inputs = [1, None, "x", {"a": 1}, 3, [1], {"error": "raw"}]
+        for stage_timing in (False, True):
+            single = self.build(stage_timing)
+            batch = self.build(stage_timing)
+            expected = [single.execute(data) for data in inputs]
+            results = batch.execute_batch(inputs)
+            self.assertEqual(
+                list(map(without_timestamps, results)),
+                list(map(without_timestamps, expected)),
+            )
+            self.assertEqual(results[4], {"error": "three", "pipeline": "BATCH"})
+            for key in ("total_processed", "successful", "failed"):
+                self.assertEqual(batch.statistics[key], single.statistics[key])
+
+
+class AdapterTest(unittest.TestCase):
+
+    def test_csv_parse_input_reads_header_row(self):
+        parsed = CSVAdapter("CSV").parse_input("id,name\n1,a\n2,b\n")
+        self.assertEqual(parsed["headers"], ["id", "name"])
+        self.assertEqual(parsed["rows"], 2)
+
+    def test_csv_keeps_non_finite_values_as_text(self):
+        source = io.BytesIO(b"a,b,c,d\nnan,inf,-Infinity,1.5\n")
+        record = next(CSVAdapter("CSV").iter_records(source))
+        self.assertEqual(record, {"a": "nan", "b": "inf", "c": "-Infinity", "d": 1.5})
+
+    def test_default_iter_records_parses_whole_source(self):
+        records = list(StreamAdapter("STREAM").iter_records(io.BytesIO(b"stream")))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["type"], "stream")
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "checkpoint.json")
+        self.manager = NexusManager()
+        self.pipeline = ProcessingPipeline("CHECKPOINTED")
+        self.pipeline.add_stage(InputStage())
+
+    def run_checkpointed(self, records, **kwargs):
+        return self.manager.run_checkpointed(
+            records, self.pipeline, self.path, **kwargs
+        )
+
+    def test_completed_run_leaves_no_checkpoint(self):
+        results = list(self.run_checkpointed(range(10), every_records=3))
+        self.assertEqual(len(results), 10)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(len(list(self.run_checkpointed(range(10)))), 10)
+
+    def test_early_stop_keeps_delivered_progress(self):
+        run = self.run_checkpointed(range(10), every_records=100)
+        offsets = [next(run)[0] for _ in range(4)]
+        run.close()
+        self.assertEqual(offsets, [0, 1, 2, 3])
+        resumed = [offset for offset, _ in self.run_checkpointed(range(10))]
+        self.assertEqual(resumed, list(range(4, 10)))
+
+    def test_reset_checkpoint(self):
+        run = self.run_checkpointed(range(10))
+        next(run)
+        run.close()
+        self.manager.reset_checkpoint(self.path)
+        self.assertEqual(len(list(self.run_checkpointed(range(10)))), 10)
+
+    def test_rejects_non_positive_interval(self):
+        for every_seconds in (0, -1.0):
+            with self.assertRaises(ValueError):
+                next(self.run_checkpointed(range(10), every_seconds=every_seconds))
+
+
+class StageTimingTest(unittest.TestCase):
+
+    def test_timed_pipeline_without_stages(self):
+        pipeline = ProcessingPipeline("EMPTY", stage_timing=True)
+        self.assertEqual(pipeline.execute({"value": 1}), {"value": 1})
+
+    def test_reset_keeps_processing_time_a_float(self):
+        pipeline = ProcessingPipeline("RESET", stage_timing=True)
+        pipeline.add_stage(InputStage())
+        pipeline.execute({"value": 1})
+        pipeline.reset_statistics()
+        self.assertEqual(pipeline.statistics["total_processed"], 0)
+        self.assertIsInstance(pipeline.statistics["processing_time"], float)
+
+    def test_prometheus_label_values_are_escaped(self):
+        pipeline = ProcessingPipeline('a\\b"c\nd', stage_timing=True)
+        pipeline.add_stage(InputStage())
+        pipeline.execute({"value": 1})
+        manager = NexusManager()
+        manager.add_pipeline(pipeline)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.prom")
+            manager.export_prometheus(path)
+            with open(path, encoding="utf-8") as file:
+                text = file.read()
+        self.assertIn('pipeline="a\\\\b\\"c\\nd"', text)
+        self.assertNotIn('\nd"', text)
+
+
+if __name__ == "__main__":
+    unittest.main()